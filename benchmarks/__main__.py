@@ -0,0 +1,110 @@
+"""
+Runs the request pipeline benchmarks.
+
+Usage:
+    python -m benchmarks [--requests N] [--routes 10,100,1000] [--params 0,4,16]
+                         [--filter NAME] [--save FILE] [--compare FILE] [--threshold 0.1]
+
+Results can be saved as JSON and compared with a previous run; the command exits
+with status 1 when a case got slower than the threshold allows, so it can gate an
+upgrade in CI.
+"""
+
+from typing import Iterator
+from benchmarks.harness import Result, measure
+from benchmarks.scenarios import (
+    Case,
+    authentication_cases,
+    htmx_cases,
+    processor_cases,
+    routing_cases,
+)
+import argparse
+import asyncio
+import orjson
+import sys
+
+
+def _sizes(value: str) -> list[int]:
+    return [int(size) for size in value.split(",") if size]
+
+
+def cases(route_counts: list[int], param_counts: list[int]) -> Iterator[Case]:
+    yield from routing_cases(route_counts)
+    yield from processor_cases(param_counts)
+    yield from authentication_cases()
+    yield from htmx_cases()
+
+
+def compare(results: list[Result], path: str, threshold: float) -> list[str]:
+    """Returns the cases whose throughput regressed against a saved run.
+
+    Args:
+        results (list[Result]): The current results.
+        path (str): The path of the saved results.
+        threshold (float): The tolerated relative slowdown.
+
+    Returns:
+        list[str]: A description of every regression.
+    """
+    with open(path, "rb") as file:
+        baseline = {entry["name"]: entry for entry in orjson.loads(file.read())}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous and result.rps < previous["rps"] * (1 - threshold):
+            regressions.append(
+                f"{result.name}: {previous['rps']:.0f} -> {result.rps:.0f} req/s"
+            )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> list[Result]:
+    results = []
+    print(
+        f"{'case':<34} {'req/s':>10} {'p50 us':>8} {'p90 us':>8}"
+        f" {'p99 us':>8} {'peak B':>8}"
+    )
+    for case in cases(args.routes, args.params):
+        if args.filter and args.filter not in case.name:
+            continue
+        result = await measure(
+            case.name, case.app, case.scope, args.requests, case.body
+        )
+        results.append(result)
+        print(
+            f"{result.name:<34} {result.rps:>10.0f} {result.p50:>8.1f}"
+            f" {result.p90:>8.1f} {result.p99:>8.1f} {result.peak_bytes:>8.0f}"
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--routes", type=_sizes, default=[10, 100, 1000])
+    parser.add_argument("--params", type=_sizes, default=[0, 4, 16])
+    parser.add_argument("--filter", default="")
+    parser.add_argument("--save")
+    parser.add_argument("--compare")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.save:
+        with open(args.save, "wb") as file:
+            file.write(
+                orjson.dumps(
+                    [result._asdict() for result in results], option=orjson.OPT_INDENT_2
+                )
+            )
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Micro-benchmark of the per-request overhead of ``Pypox.__call__``.
+
+The same plain route is mounted in a bare Starlette app and in a Pypox app, and
+both are called directly through the ASGI interface with a synthetic scope, so the
+difference is the cost Pypox adds to every request. The cost of the processor that
+``Pypox.add_route`` wraps endpoints in is reported as a separate case.
+
+Usage:
+    python -m benchmarks.app_call [--requests N]
+"""
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from pypox.application import Pypox
+from benchmarks.harness import make_scope, measure
+import argparse
+import asyncio
+
+
+async def endpoint(request: Request):
+    return PlainTextResponse("ok")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    apps = {
+        "starlette": Starlette(routes=[Route("/", endpoint)]),
+        "pypox": Pypox(openapi_url=None),
+        "processor": Pypox(openapi_url=None),
+    }
+    apps["pypox"].router.routes.append(Route("/", endpoint))
+    apps["processor"].add_route("/", endpoint, methods=["GET"])
+    latency = {}
+    for name, app in apps.items():
+        result = asyncio.run(measure(name, app, make_scope(app), args.requests))
+        latency[name] = 1e6 / result.rps
+        print(
+            f"{name:<10} {latency[name]:8.2f} us/request"
+            f" {result.peak_bytes:8.1f} peak bytes/request"
+        )
+    overhead = latency["pypox"] - latency["starlette"]
+    print(f"{'overhead':<10} {overhead:8.2f} us/request")
+    overhead = latency["processor"] - latency["pypox"]
+    print(f"{'add_route':<10} {overhead:8.2f} us/request for the processor")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Measurement helpers shared by the benchmarks.
+
+Applications are called directly through the ASGI interface with synthetic scopes,
+so the numbers contain the cost of pypox and Starlette only, without a server or
+a network stack.
+
+Classes:
+    - Result: The measurements of one benchmark.
+
+Functions:
+    - make_scope: Builds a synthetic HTTP scope.
+    - measure: Runs a benchmark and returns its measurements.
+"""
+
+from typing import Any, NamedTuple
+from urllib.parse import urlencode
+import time
+import tracemalloc
+
+Scope = dict[str, Any]
+
+
+class Result(NamedTuple):
+    """The measurements of one benchmark.
+
+    Attributes:
+        name (str): The name of the benchmark.
+        requests (int): The number of timed requests.
+        rps (float): The requests per second.
+        p50 (float): The median latency in microseconds.
+        p90 (float): The 90th percentile latency in microseconds.
+        p99 (float): The 99th percentile latency in microseconds.
+        peak_bytes (float): The average peak of traced memory per request in bytes.
+    """
+
+    name: str
+    requests: int
+    rps: float
+    p50: float
+    p90: float
+    p99: float
+    peak_bytes: float
+
+
+def make_scope(
+    app: Any,
+    path: str = "/",
+    method: str = "GET",
+    query: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+) -> Scope:
+    """Builds a synthetic HTTP scope.
+
+    Args:
+        app (Any): The application, stored in the scope like servers do.
+        path (str, optional): The request path. Defaults to "/".
+        method (str, optional): The request method. Defaults to "GET".
+        query (dict[str, Any] | None, optional): The query parameters. Defaults to None.
+        headers (dict[str, str] | None, optional): The request headers. Defaults to None.
+
+    Returns:
+        Scope: The scope.
+    """
+    raw_headers = [(b"host", b"testserver")]
+    for key, value in (headers or {}).items():
+        raw_headers.append((key.lower().encode("latin-1"), value.encode("latin-1")))
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": urlencode(query or {}).encode(),
+        "headers": raw_headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+        "app": app,
+    }
+
+
+class _Receiver:
+    """Sends the request body once, then a disconnect like a server would."""
+
+    __slots__ = ("body", "sent")
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+        self.sent = False
+
+    async def __call__(self) -> dict:
+        if self.sent:
+            return {"type": "http.disconnect"}
+        self.sent = True
+        return {"type": "http.request", "body": self.body, "more_body": False}
+
+
+class _Sender:
+    __slots__ = ("status",)
+
+    def __init__(self) -> None:
+        self.status = 0
+
+    async def __call__(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+
+
+def _percentile(samples: list[int], fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] / 1000
+
+
+async def measure(
+    name: str,
+    app: Any,
+    scope: Scope,
+    requests: int = 10000,
+    body: bytes = b"",
+    memory_requests: int = 200,
+    expected_status: int = 200,
+) -> Result:
+    """Runs a benchmark and returns its measurements.
+
+    The application is called once to warm it up and to check the status code,
+    then ``requests`` times with timing, then ``memory_requests`` times with
+    ``tracemalloc`` enabled, because tracing slows the calls down.
+
+    Args:
+        name (str): The name of the benchmark.
+        app (Any): The ASGI application.
+        scope (Scope): The scope of every request; each call receives a copy.
+        requests (int, optional): The number of timed requests. Defaults to 10000.
+        body (bytes, optional): The request body. Defaults to b"".
+        memory_requests (int, optional): The number of traced requests. Defaults to 200.
+        expected_status (int, optional): The status code the application must return. Defaults to 200.
+
+    Raises:
+        RuntimeError: If the application does not answer with the expected status.
+
+    Returns:
+        Result: The measurements.
+    """
+    receive = _Receiver(body)
+    send = _Sender()
+    await app(dict(scope), receive, send)
+    if send.status != expected_status:
+        raise RuntimeError(f"{name}: expected {expected_status}, got {send.status}")
+
+    samples: list[int] = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(requests):
+        receive.sent = False
+        before = clock()
+        await app(dict(scope), receive, send)
+        samples.append(clock() - before)
+    total = (clock() - start) / 1e9
+    samples.sort()
+
+    tracemalloc.start()
+    peak = 0
+    for _ in range(memory_requests):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        receive.sent = False
+        await app(dict(scope), receive, send)
+        peak += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+
+    return Result(
+        name,
+        requests,
+        requests / total,
+        _percentile(samples, 0.5),
+        _percentile(samples, 0.9),
+        _percentile(samples, 0.99),
+        peak / memory_requests if memory_requests else 0.0,
+    )
@@ -0,0 +1,274 @@
+"""
+The benchmark cases of the request pipeline.
+
+Every function returns the cases of one area of pypox. Route counts and parameter
+counts are parameters, so the same cases can be measured for a matrix of sizes.
+
+Classes:
+    - Case: An application and the request sent to it.
+
+Functions:
+    - routing_cases: Route matching in Starlette, Pypox and the file-based routers.
+    - processor_cases: Parameter extraction in processor-decorated endpoints.
+    - authentication_cases: The bearer and basic authentication middlewares.
+    - htmx_cases: A PypoxHTMX page.
+"""
+
+from typing import Any, Callable, Iterator, NamedTuple
+from jose import jwt
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from pypox._types import BodyDict, QueryInt
+from pypox.application import Pypox, PypoxHTMX
+from pypox.authentication import BasicTokenMiddleware, BearerTokenMiddleware
+from pypox.processing.base import processor
+from pypox.router import HTTPRouter
+from benchmarks.harness import Scope, make_scope
+import base64
+import inspect
+import os
+import orjson
+import tempfile
+
+# Directories of the generated file-based apps, removed when the process exits.
+_directories: list[tempfile.TemporaryDirectory] = []
+
+ENDPOINT_SOURCE = """\
+from starlette.responses import PlainTextResponse
+
+
+async def endpoint(request):
+    return PlainTextResponse("ok")
+"""
+
+PAGE_SOURCE = """\
+from starlette.responses import HTMLResponse
+
+
+async def page(request):
+    return HTMLResponse("<main><h1>Dashboard</h1></main>")
+"""
+
+TEMPLATE_PAGE_SOURCE = """\
+async def page(request):
+    return request.app.state.templates.PageResponse(
+        request, "report/page.html", {"rows": range(200)}
+    )
+"""
+
+LAYOUT_TEMPLATE = (
+    "<html><head><title>Report</title></head><body>"
+    "<nav>{% for i in range(50) %}<a href='/{{ i }}'>{{ i }}</a>{% endfor %}</nav>"
+    "{% block report_table %}{% endblock %}</body></html>"
+)
+
+REPORT_TEMPLATE = (
+    "{% extends 'base.html' %}{% block report_table %}<table>"
+    "{% for row in rows %}<tr><td>{{ row }}</td></tr>{% endfor %}"
+    "</table>{% endblock %}"
+)
+
+
+class Case(NamedTuple):
+    """An application and the request sent to it.
+
+    Attributes:
+        name (str): The name of the case.
+        app (Any): The ASGI application.
+        scope (Scope): The scope of the request.
+        body (bytes): The body of the request.
+    """
+
+    name: str
+    app: Any
+    scope: Scope
+    body: bytes = b""
+
+
+async def plain_endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+def _route_tree(files: dict[str, str]) -> str:
+    directory = tempfile.TemporaryDirectory(prefix="pypox-bench-")
+    _directories.append(directory)
+    for path, source in files.items():
+        path = os.path.join(directory.name, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(source)
+    return directory.name
+
+
+def routing_cases(route_counts: list[int]) -> Iterator[Case]:
+    """Yields the route matching cases.
+
+    Each app has ``count`` routes with a path parameter and the request targets
+    the last one, which is the worst case for linear matching.
+
+    Args:
+        route_counts (list[int]): The numbers of routes.
+
+    Yields:
+        Iterator[Case]: The cases.
+    """
+    for count in route_counts:
+        starlette = Starlette(
+            routes=[Route(f"/r{i}/{{id}}/", plain_endpoint) for i in range(count)]
+        )
+        yield Case(
+            f"starlette/routes={count}",
+            starlette,
+            make_scope(starlette, f"/r{count - 1}/7/"),
+        )
+
+        app = Pypox(openapi_url=None)
+        for i in range(count):
+            app.add_route(f"/r{i}/{{id}}/", plain_endpoint, methods=["GET"])
+        yield Case(f"pypox/routes={count}", app, make_scope(app, f"/r{count - 1}/7/"))
+
+        directory = _route_tree(
+            {f"r{i}/[id]/get.py": ENDPOINT_SOURCE for i in range(count)}
+        )
+        for radix in (False, True):
+            app = Pypox(
+                conventions=[HTTPRouter(directory, radix=radix)], openapi_url=None
+            )
+            name = "http_router_radix" if radix else "http_router"
+            yield Case(
+                f"{name}/routes={count}", app, make_scope(app, f"/r{count - 1}/7/")
+            )
+
+
+def _query_endpoint(count: int) -> Callable:
+    async def endpoint(**params: int) -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    endpoint.__signature__ = inspect.Signature(  # type: ignore[attr-defined]
+        [
+            inspect.Parameter(
+                f"p{i}", inspect.Parameter.KEYWORD_ONLY, annotation=QueryInt
+            )
+            for i in range(count)
+        ]
+    )
+    return endpoint
+
+
+def processor_cases(param_counts: list[int]) -> Iterator[Case]:
+    """Yields the parameter extraction cases.
+
+    Args:
+        param_counts (list[int]): The numbers of query parameters.
+
+    Yields:
+        Iterator[Case]: The cases.
+    """
+    for count in param_counts:
+        app = Starlette(routes=[Route("/", processor()(_query_endpoint(count)))])
+        yield Case(
+            f"processor/query_params={count}",
+            app,
+            make_scope(app, query={f"p{i}": i for i in range(count)}),
+        )
+
+    @processor()
+    async def json_endpoint(data: BodyDict) -> dict:
+        return data
+
+    app = Starlette(routes=[Route("/", json_endpoint, methods=["POST"])])
+    body = orjson.dumps({f"key{i}": i for i in range(32)})
+    yield Case(
+        "processor/json_body",
+        app,
+        make_scope(app, method="POST", headers={"content-type": "application/json"}),
+        body,
+    )
+
+
+def authentication_cases() -> Iterator[Case]:
+    """Yields the authentication middleware cases.
+
+    Yields:
+        Iterator[Case]: The cases.
+    """
+    token = jwt.encode({"sub": "user"}, "secret", algorithm="HS256")
+    for cache_size in (0, 1024):
+        app = Starlette(
+            routes=[Route("/protected", plain_endpoint)],
+            middleware=[
+                Middleware(
+                    BearerTokenMiddleware,
+                    secret_key="secret",
+                    routes=["/protected"],
+                    cache_size=cache_size,
+                )
+            ],
+        )
+        name = "bearer_cached" if cache_size else "bearer"
+        yield Case(
+            f"auth/{name}",
+            app,
+            make_scope(app, "/protected", headers={"authorization": f"Bearer {token}"}),
+        )
+
+    credentials = base64.b64encode(b"user:password").decode()
+    for cache_size in (0, 1024):
+        app = Starlette(
+            routes=[Route("/protected", plain_endpoint)],
+            middleware=[
+                Middleware(
+                    BasicTokenMiddleware,
+                    validator=lambda username, password: password == "password",
+                    routes=["/protected"],
+                    cache_size=cache_size,
+                )
+            ],
+        )
+        name = "basic_cached" if cache_size else "basic"
+        yield Case(
+            f"auth/{name}",
+            app,
+            make_scope(
+                app, "/protected", headers={"authorization": f"Basic {credentials}"}
+            ),
+        )
+
+
+def htmx_cases() -> Iterator[Case]:
+    """Yields the PypoxHTMX cases.
+
+    Yields:
+        Iterator[Case]: The cases.
+    """
+    directory = _route_tree({"dashboard/page.py": PAGE_SOURCE})
+    app = PypoxHTMX(directory)
+    yield Case("htmx/page", app, make_scope(app, "/dashboard/"))
+    yield Case(
+        "htmx/page_htmx_request",
+        app,
+        make_scope(app, "/dashboard/", headers={"hx-request": "true"}),
+    )
+
+    directory = _route_tree(
+        {
+            "base.html": LAYOUT_TEMPLATE,
+            "report/page.html": REPORT_TEMPLATE,
+            "report/page.py": TEMPLATE_PAGE_SOURCE,
+        }
+    )
+    app = PypoxHTMX(directory, template_cache=False)
+    yield Case("htmx/template_page", app, make_scope(app, "/report/"))
+    yield Case(
+        "htmx/template_fragment",
+        app,
+        make_scope(
+            app, "/report/", headers={"hx-request": "true", "hx-target": "report-table"}
+        ),
+    )
+
+    app = PypoxHTMX(directory, template_cache=False, streaming=True)
+    yield Case("htmx/template_page_streaming", app, make_scope(app, "/report/"))
@@ -11,6 +11,7 @@
 """
 
 import os
+from types import MappingProxyType
 from typing import (
     Any,
     Awaitable,
@@ -27,10 +28,19 @@ from starlette.middleware import Middleware
 from starlette.requests import Request
 from starlette.responses import Response
 from starlette.routing import Route, Router, Mount, BaseRoute
-from starlette.types import ExceptionHandler, Lifespan, Receive, Scope, Send
+from starlette.types import ASGIApp, ExceptionHandler, Lifespan, Receive, Scope, Send
 from pypox.processing.base import PypoxProcessor, processor
-from pypox.router import BaseRouter
+from pypox.router import BaseRouter, replace_route, wrap_lifespan
+from pypox.instrumentation import (
+    RequestSpanMiddleware,
+    RoutingSpanMiddleware,
+    instrumentation,
+)
 from pypox.openapi.main import OpenAPI, Info, License
+from pypox.openapi.endpoint import OpenAPIEndpoint
+from pypox.fragments import FragmentCache
+from pypox.templating import TEMPLATE_EXTENSIONS, PypoxTemplates
+from pypox.openapi.generator import OpenAPIGenerator
 
 
 class Pypox(Starlette):
@@ -49,6 +59,7 @@ class Pypox(Starlette):
         on_startup (Sequence[Callable[[], Any]] | None): The startup functions.
         on_shutdown (Sequence[Callable[[], Any]] | None): The shutdown functions.
         lifespan (Lifespan | None): The lifespan of the application.
+        openapi (OpenAPIEndpoint | None): The app serving the OpenAPI document, None if disabled.
     """
 
     def __init__(
@@ -64,6 +75,7 @@ class Pypox(Starlette):
         info: Info = Info(title="Pypox", version="0.0.1", license=License(name="MIT")),
         license: License = License(name="MIT"),
         validators: list[Any] = [],
+        openapi_url: str | None = "/openapi.json",
     ) -> None:
         """
         Initialize the Pypox application.
@@ -80,21 +92,47 @@ class Pypox(Starlette):
             info (Info, optional): The information about the application. Defaults to Info(title="Pypox", version="0.0.1", license=License(name="MIT")).
             license (License, optional): The license information. Defaults to License(name="MIT").
             validators (list[Any], optional): A list of validators. Defaults to [].
+            openapi_url (str | None, optional): The path serving the OpenAPI document,
+                None to disable it. Defaults to "/openapi.json".
         """
 
         self._openapi_version = open_api_version
         self._info = info
         self._license = license
+        self._openapi_metadata = MappingProxyType(
+            {"openapi": open_api_version, "info": info, "license": license}
+        )
         self._validators = validators
         routes: list[BaseRoute] = []
+        startup_hooks: list[Callable[[], Any]] = []
+        shutdown_hooks: list[Callable[[], Any]] = []
         if conventions:
             for convention in conventions:
-                endpoints = convention.generate_routes()
-                for endpoint in endpoints:
-                    endpoint.endpoint = PypoxProcessor(
-                        endpoint.endpoint, validators
-                    ).validate
-                routes.extend(endpoints)
+                routes.extend(convention.routes)
+                convention.add_route_listener(self._replace_route)
+                convention.add_reload_listener(self._routes_reloaded)
+                startup_hooks.extend(convention.startup_hooks)
+                shutdown_hooks.extend(convention.shutdown_hooks)
+        if lifespan is None:
+            on_startup = [*(on_startup or []), *startup_hooks]
+            on_shutdown = [*(on_shutdown or []), *shutdown_hooks]
+        elif startup_hooks or shutdown_hooks:
+            lifespan = wrap_lifespan(lifespan, startup_hooks, shutdown_hooks)
+        self.openapi: OpenAPIEndpoint | None = None
+        if openapi_url:
+            if info.license is None:
+                info = info.model_copy(update={"license": license})
+            self.openapi = OpenAPIEndpoint(
+                lambda: self.router.routes, OpenAPIGenerator(open_api_version, info)
+            )
+            routes.append(
+                Route(
+                    openapi_url,
+                    self.openapi,
+                    methods=["GET", "HEAD"],
+                    include_in_schema=False,
+                )
+            )
         super().__init__(
             debug,
             routes,
@@ -105,25 +143,63 @@ class Pypox(Starlette):
             lifespan,
         )
 
-    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    def _replace_route(self, old: BaseRoute | None, new: BaseRoute | None) -> None:
         """
-        Handle incoming requests.
+        Apply a route change reloaded by one of the conventions.
 
         Args:
-            scope (Scope): The request scope.
-            receive (Receive): The receive function.
-            send (Send): The send function.
+            old (BaseRoute | None): The replaced or removed route.
+            new (BaseRoute | None): The new or added route.
+        """
+
+        replace_route(self.router.routes, old, new)
+        if self.openapi is not None:
+            self.openapi.invalidate()
+
+    def _routes_reloaded(self) -> None:
+        """
+        Invalidate the cached OpenAPI document after a convention reloaded endpoints.
+        """
+
+        if self.openapi is not None:
+            self.openapi.invalidate()
+
+    @property
+    def openapi_metadata(self) -> Mapping[str, Any]:
+        """
+        Return the OpenAPI metadata of the application.
+
+        The metadata used to be written into the scope of every request. It never
+        changes, so it is built once and shared instead.
 
         Returns:
-            None: No return value.
+            Mapping[str, Any]: The read-only OpenAPI version, info and license of the application.
+        """
+
+        return self._openapi_metadata
+
+    def build_middleware_stack(self) -> ASGIApp:
         """
+        Build the middleware stack, wrapped in the span recorders when instrumentation is enabled.
 
-        scope["openapi"] = {
-            "openapi": self._openapi_version,
-            "info": self._info,
-            "license": self._license,
-        }
-        return await super().__call__(scope, receive, send)
+        The stack is built on the first request, so hooks must be registered on
+        ``pypox.instrumentation.instrumentation`` before it to record the request,
+        route matching and response send spans.
+
+        Returns:
+            ASGIApp: The middleware stack.
+        """
+
+        if not instrumentation.enabled:
+            return super().build_middleware_stack()
+        router = self.router
+        # The innermost app of the stack is self.router; wrap it for the build only.
+        self.router = RoutingSpanMiddleware(router)  # type: ignore[assignment]
+        try:
+            app = super().build_middleware_stack()
+        finally:
+            self.router = router
+        return RequestSpanMiddleware(app)
 
     def add_route(
         self,
@@ -158,6 +234,8 @@ class Pypox(Starlette):
                 include_in_schema=include_in_schema,
             )
         )
+        if self.openapi is not None:
+            self.openapi.invalidate()
 
 
 class PypoxHTMX(BaseRouter):
@@ -171,6 +249,7 @@ class PypoxHTMX(BaseRouter):
         _openapi_version (str): The OpenAPI version.
         _info (Info): The information about the application.
         _license (License): The license information.
+        templates (PypoxTemplates | None): The templates shared by the pages, None without a directory.
     """
 
     def __init__(
@@ -183,6 +262,14 @@ class PypoxHTMX(BaseRouter):
         open_api_version: str = "3.0.3",
         info: Info = Info(title="Pypox", version="0.0.1", license=License(name="MIT")),
         license: License = License(name="MIT"),
+        templates_directory: str | Sequence[str] | None = None,
+        template_cache: str | bool = True,
+        template_extensions: Sequence[str] = TEMPLATE_EXTENSIONS,
+        fragments: bool = True,
+        streaming: bool = False,
+        chunk_size: int = 16384,
+        fragment_cache: FragmentCache | None = None,
+        debug: bool = False,
     ) -> None:
         """
         Initialize the PypoxHTMX application.
@@ -196,6 +283,14 @@ class PypoxHTMX(BaseRouter):
             open_api_version (str, optional): The OpenAPI version. Defaults to "3.0.3".
             info (Info, optional): The information about the application. Defaults to Info(title="Pypox", version="0.0.1", license=License(name="MIT")).
             license (License, optional): The license information. Defaults to License(name="MIT").
+            templates_directory (str | Sequence[str] | None, optional): The template directories. Defaults to the page directory.
+            template_cache (str | bool, optional): The bytecode cache directory, True for the default directory or False to disable it. Defaults to True.
+            template_extensions (Sequence[str], optional): The file extensions of the templates compiled at startup. Defaults to TEMPLATE_EXTENSIONS.
+            fragments (bool, optional): Whether page responses render only the hx-target block for HTMX requests. Defaults to True.
+            streaming (bool, optional): Whether page responses are streamed while they render. Defaults to False.
+            chunk_size (int, optional): The minimum size of the streamed chunks. Defaults to 16384.
+            fragment_cache (FragmentCache | None, optional): The cache of the {% cache %} template tag. Defaults to a cache in process memory.
+            debug (bool, optional): Whether changed templates are reloaded instead of compiled once at startup. Defaults to False.
         """
 
         self._openapi_version = open_api_version
@@ -206,12 +301,29 @@ class PypoxHTMX(BaseRouter):
         )
         if self._directory:
             self._router = Starlette(
-                routes=self.generate_routes(),
+                routes=self.routes,
                 middleware=middleware,
                 on_startup=on_startup,
                 on_shutdown=on_shutdown,
                 lifespan=lifespan,
+                debug=debug,
+            )
+        self.templates: PypoxTemplates | None = None
+        if self._directory or templates_directory:
+            self.templates = PypoxTemplates(
+                templates_directory or self._directory,
+                cache_directory=template_cache,
+                auto_reload=debug,
+                template_extensions=template_extensions,
+                fragments=fragments,
+                streaming=streaming,
+                chunk_size=chunk_size,
+                fragment_cache=fragment_cache,
             )
+            if not debug:
+                self.templates.compile_all()
+            if hasattr(self, "_router"):
+                self._router.state.templates = self.templates
 
     async def __call__(
         self,
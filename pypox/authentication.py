@@ -6,72 +6,511 @@ The module provides two middleware classes: `BearerTokenMiddleware` and `BasicTo
 is used for handling basic token authentication.
 
 Classes:
+    - TokenCache: A bounded cache of verified token claims.
+    - VerificationPool: A bounded executor pool verifying tokens off the event loop.
+    - KeySet: A JSON Web Key Set indexed by key id.
     - BearerTokenMiddleware: Middleware for handling bearer token authentication.
     - BasicTokenMiddleware: Middleware for handling basic token authentication.
 """
 
-from typing import Callable
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+from starlette._utils import is_async_callable
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
-from jose import jwt
-from jose.exceptions import ExpiredSignatureError, JWTError
+from jose import jwk, jwt
+from jose.backends.base import Key
+from jose.exceptions import ExpiredSignatureError, JOSEError, JWTError
 from starlette.responses import JSONResponse
 from starlette.requests import Request
 from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+from pypox.routeset import RouteSet
+import asyncio
 import base64
+import binascii
+import hashlib
+import orjson
+import os
+import threading
+import time
 
 
-class BearerTokenMiddleware(BaseHTTPMiddleware):
+def _get_header(scope: Scope, name: bytes) -> str:
+    for key, value in scope["headers"]:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return ""
+
+
+class TokenCache:
+    """A bounded LRU cache of verified token claims.
+
+    Tokens are keyed by their SHA-256 digest, so the cache never holds the tokens
+    themselves. Claims are kept until the earlier of the token's ``exp`` claim and
+    the configured time to live; the least recently used entry is evicted when the
+    cache is full.
+
+    Args:
+        maxsize (int, optional): The maximum number of cached tokens. Defaults to 1024.
+        ttl (float, optional): The maximum time in seconds a token stays cached. Defaults to 60.0.
+        salt (bytes, optional): The salt hashed with every token. Defaults to b"".
+
+    Attributes:
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that required a verification.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttl: float = 60.0, salt: bytes = b""
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._salt = salt
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
+    def get(self, token: str) -> dict | None:
+        """Returns the cached claims of a token.
+
+        Args:
+            token (str): The encoded token.
+
+        Returns:
+            dict | None: A copy of the claims, or None if the token is not cached or expired.
+        """
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(claims)
+
+    def set(self, token: str, claims: dict) -> None:
+        """Caches the verified claims of a token.
+
+        Args:
+            token (str): The encoded token.
+            claims (dict): The verified claims.
+        """
+        expires_at = time.time() + self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        key = self._key(token)
+        self._entries[key] = (expires_at, dict(claims))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _key(self, token: str) -> bytes:
+        return hashlib.sha256(self._salt + token.encode()).digest()
+
+    def clear(self) -> None:
+        """Removes every cached token."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _decode_token(token: str, key: Any, algorithms: list[str]) -> dict:
+    return jwt.decode(token, key, algorithms=algorithms)
+
+
+class VerificationPool:
+    """A bounded executor pool verifying tokens off the event loop.
+
+    Verifying RS256 or ES256 signatures is CPU-bound, so running it on the event
+    loop stalls every other connection of the worker. The pool runs verifications
+    in a thread or process pool, admits at most ``max_workers`` of them at a time
+    and rejects a verification that waited longer than ``queue_timeout`` for a slot.
+
+    The executor is created on first use, so a pool can be declared at import time.
+
+    Args:
+        max_workers (int, optional): The number of concurrent verifications. Defaults to 4.
+        queue_timeout (float, optional): The time in seconds to wait for a free slot. Defaults to 1.0.
+        processes (bool, optional): Whether to use a process pool instead of a thread pool. Defaults to False.
+
+    Attributes:
+        waiting (int): The number of verifications waiting for a slot.
+        in_flight (int): The number of verifications running.
+        completed (int): The number of finished verifications.
+        rejected (int): The number of verifications rejected after the queue timeout.
+        total_latency (float): The total time in seconds spent running verifications.
+        max_latency (float): The longest verification time in seconds.
+    """
+
+    def __init__(
+        self, max_workers: int = 4, queue_timeout: float = 1.0, processes: bool = False
+    ) -> None:
+        self.max_workers = max_workers
+        self.queue_timeout = queue_timeout
+        self.processes = processes
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._executor: Executor | None = None
+
+    @property
+    def executor(self) -> Executor:
+        """Returns the executor of the pool, creating it on first use.
+
+        Returns:
+            Executor: The thread or process pool executor.
+        """
+        if self._executor is None:
+            if self.processes:
+                self._executor = ProcessPoolExecutor(self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="pypox-verify"
+                )
+        return self._executor
+
+    async def decode(self, token: str, key: Any, algorithms: list[str]) -> dict:
+        """Verifies and decodes a token in the pool.
+
+        Args:
+            token (str): The encoded token.
+            key (Any): The key used for verification.
+            algorithms (list[str]): The allowed algorithms.
+
+        Raises:
+            TimeoutError: If no slot became free within the queue timeout.
+            JWTError: If the token is invalid or expired.
+
+        Returns:
+            dict: The claims of the token.
+        """
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise TimeoutError("Token verification queue is full") from None
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, _decode_token, token, key, algorithms
+            )
+        finally:
+            latency = time.perf_counter() - start
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            self._semaphore.release()
+
+    def metrics(self) -> dict[str, float]:
+        """Returns the current metrics of the pool.
+
+        Returns:
+            dict[str, float]: The queue depth, in-flight, completed and rejected counts and the latencies.
+        """
+        return {
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "average_latency": (
+                self.total_latency / self.completed if self.completed else 0.0
+            ),
+            "max_latency": self.max_latency,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shuts the executor down.
+
+        Args:
+            wait (bool, optional): Whether to wait for running verifications. Defaults to True.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+class KeySet:
+    """A JSON Web Key Set indexed by key id.
+
+    The key set document is read from a local file or returned by a loader, and
+    every key is parsed once when the document is loaded. Lookups are a dictionary
+    access; an unknown ``kid`` triggers a reload, at most once per
+    ``min_refresh_interval``, so rotated keys are picked up without letting bad
+    tokens force a reload on every request. ``start`` additionally reloads the
+    document on a schedule from a background thread.
+
+    Args:
+        path (str | None, optional): The path of the JWKS document. Defaults to None.
+        loader (Callable[[], dict] | None, optional): A callable returning the JWKS document. Defaults to None.
+        refresh_interval (float, optional): The background reload interval in seconds. Defaults to 300.0.
+        min_refresh_interval (float, optional): The minimum time in seconds between reloads
+            triggered by unknown key ids. Defaults to 30.0.
+        algorithm (str | None, optional): The algorithm of keys without an ``alg`` member.
+            Defaults to the algorithm of the middleware using the key set.
+
+    Raises:
+        ValueError: If neither or both of path and loader are given.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        loader: Callable[[], dict] | None = None,
+        refresh_interval: float = 300.0,
+        min_refresh_interval: float = 30.0,
+        algorithm: str | None = None,
+    ) -> None:
+        if (path is None) == (loader is None):
+            raise ValueError("KeySet requires either a path or a loader")
+        self.path = path
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.algorithm = algorithm
+        self._keys: dict[str | None, Key] = {}
+        self._documents: dict[str | None, dict] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def load(self) -> None:
+        """Reads the key set document and replaces the parsed keys.
+
+        Keys without an ``alg`` member are parsed with ``algorithm``, since the
+        member is optional in a JWK. Keys that cannot be parsed are skipped. The
+        new index is swapped in at
+        once, so concurrent lookups see either the old or the new keys.
+        """
+        with self._lock:
+            # Failed loads count too, so a broken source is not retried per request.
+            self._loaded_at = time.monotonic()
+            if self.loader is not None:
+                document = self.loader()
+            else:
+                with open(self.path, "rb") as file:  # type: ignore[arg-type]
+                    document = orjson.loads(file.read())
+            keys: dict[str | None, Key] = {}
+            documents: dict[str | None, dict] = {}
+            for data in document.get("keys", []):
+                try:
+                    key = jwk.construct(
+                        data, algorithm=data.get("alg") or self.algorithm
+                    )
+                except JOSEError:
+                    continue
+                keys[data.get("kid")] = key
+                documents[data.get("kid")] = data
+            self._keys, self._documents = keys, documents
+
+    def get(self, kid: str | None, refresh: bool = True) -> Key | None:
+        """Returns the parsed key of a key id.
+
+        A failed reload keeps the last good keys.
+
+        Args:
+            kid (str | None): The key id from the token header.
+            refresh (bool, optional): Whether an unknown key id may reload the keys. Defaults to True.
+
+        Returns:
+            Key | None: The key, or None if the key id is unknown.
+        """
+        key = self._keys.get(kid)
+        if key is None and refresh and self._should_refresh():
+            try:
+                self.load()
+            except Exception:
+                return None
+            key = self._keys.get(kid)
+        return key
+
+    def document(self, kid: str | None) -> dict | None:
+        """Returns the JWK document of a key id.
+
+        Process pools cannot receive parsed keys, so they are given the document.
+
+        Args:
+            kid (str | None): The key id.
+
+        Returns:
+            dict | None: The JWK document, or None if the key id is unknown.
+        """
+        return self._documents.get(kid)
+
+    def _should_refresh(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= self.min_refresh_interval
+        )
+
+    def start(self) -> None:
+        """Loads the keys and starts reloading them in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.load()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="pypox-keyset", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the background reload and waits for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.load()
+            except Exception:
+                # Keep serving the last good keys until the next reload succeeds.
+                pass
+
+    def __contains__(self, kid: str | None) -> bool:
+        return kid in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class BearerTokenMiddleware:
     """
     Middleware for handling bearer token authentication.
 
+    The middleware is a plain ASGI app: the path is checked against the compiled set
+    of protected routes before anything else, so unprotected requests are passed on
+    without building a request object.
+
     Args:
         app (ASGIApp): The ASGI application to wrap with the middleware.
-        secret_key (str): The secret key used for token verification.
-        algorithm (str): The algorithm used for token verification.
+        secret_key (str | None, optional): The secret key used for token verification. Defaults to None.
+        algorithm (str, optional): The algorithm used for token verification, unless the key
+            of a key set declares its own. Defaults to "HS256".
         expires_in (int, optional): The expiration time for tokens in seconds. Defaults to 3600.
-        routes (list[str]): The list of protected routes that require authentication.
+        routes (list[str] | RouteSet): The protected route templates, or a compiled route set
+            shared with other middleware. Routes ending with ``*`` protect every path below them.
+        cache_size (int, optional): The number of verified tokens to cache, 0 to disable the cache. Defaults to 0.
+        cache_ttl (float, optional): The maximum time in seconds a verified token stays cached. Defaults to 60.0.
+        pool (VerificationPool | None, optional): The pool verifying tokens off the event loop,
+            None to verify on the event loop. Defaults to None.
+        keys (KeySet | None, optional): The key set selecting the verification key by the ``kid``
+            of the token, instead of the secret key. Defaults to None.
+
+    Raises:
+        ValueError: If neither a secret key nor a key set is given.
     """
 
     def __init__(
         self,
-        app,
-        secret_key: str,
-        algorithm: str,
+        app: ASGIApp,
+        secret_key: str | None = None,
+        algorithm: str = "HS256",
         expires_in: int = 3600,
-        routes: list[str] = [],
+        routes: list[str] | RouteSet = [],
+        cache_size: int = 0,
+        cache_ttl: float = 60.0,
+        pool: VerificationPool | None = None,
+        keys: KeySet | None = None,
     ):
+        if secret_key is None and keys is None:
+            raise ValueError("BearerTokenMiddleware requires a secret_key or keys")
+        self.app = app
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.expires_in = expires_in
         self.protected_routes = routes
-        super().__init__(app)
+        self.route_set = routes if isinstance(routes, RouteSet) else RouteSet(routes)
+        self.cache = TokenCache(cache_size, cache_ttl) if cache_size else None
+        self.pool = pool
+        self.keys = keys
+        if keys is not None and keys.algorithm is None:
+            keys.algorithm = algorithm
 
-    async def dispatch(self, request: Request, call_next):
-        """Dispatches the request and performs authentication.
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Authenticates requests to protected routes and calls the wrapped app.
 
         Args:
-            request (Request): The incoming request object.
-            call_next (Callable): The next middleware or route handler.
-
-        Returns:
-            Response: The response returned by the next middleware or route handler.
+            scope (Scope): The request scope.
+            receive (Receive): The receive function.
+            send (Send): The send function.
         """
-        if not any(
-            [route for route in self.protected_routes if request.url.path in route]
-        ):
-            return await call_next(request)
+        if scope["type"] != "http" or not self.route_set.matches(scope):
+            await self.app(scope, receive, send)
+            return
 
-        bearer, token = request.headers.get("Authorization", "").split(" ")
-        if bearer.lower() != "bearer":
-            return JSONResponse({"detail": "Invalid token type"}, status_code=401)
+        bearer, _, token = _get_header(scope, b"authorization").partition(" ")
+        if bearer.lower() != "bearer" or not token:
+            response = JSONResponse({"detail": "Invalid token type"}, status_code=401)
+            await response(scope, receive, send)
+            return
+        payload = self.cache.get(token) if self.cache is not None else None
+        if payload is not None:
+            scope.setdefault("state", {})["user"] = payload
+            await self.app(scope, receive, send)
+            return
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            key, algorithms = await self._verification_key(token)
+            if self.pool is not None:
+                payload = await self.pool.decode(token, key, algorithms)
+            else:
+                payload = _decode_token(token, key, algorithms)
+        except TimeoutError:
+            response = JSONResponse(
+                {"detail": "Token verification unavailable"},
+                status_code=503,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
         except ExpiredSignatureError:
-            return JSONResponse({"detail": "Token has expired"}, status_code=401)
+            response = JSONResponse({"detail": "Token has expired"}, status_code=401)
+            await response(scope, receive, send)
+            return
         except JWTError:
-            return JSONResponse({"detail": "Invalid token"}, status_code=401)
-        request.state.user = payload
-        return await call_next(request)
+            response = JSONResponse({"detail": "Invalid token"}, status_code=401)
+            await response(scope, receive, send)
+            return
+        if self.cache is not None:
+            self.cache.set(token, payload)
+        scope.setdefault("state", {})["user"] = payload
+        await self.app(scope, receive, send)
+
+    async def _verification_key(self, token: str) -> tuple[Any, list[str]]:
+        if self.keys is None:
+            return self.secret_key, [self.algorithm]
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.keys.get(kid, refresh=False)
+        if key is None:
+            # Reloading reads a file or calls the loader, which may block.
+            key = await run_in_threadpool(self.keys.get, kid)
+        if key is None:
+            raise JWTError("Unknown key id")
+        document = self.keys.document(kid) or {}
+        algorithms = [document.get("alg") or self.algorithm]
+        if self.pool is not None and self.pool.processes:
+            return document, algorithms
+        return key, algorithms
 
 
 class BasicTokenMiddleware(BaseHTTPMiddleware):
@@ -80,20 +519,37 @@ class BasicTokenMiddleware(BaseHTTPMiddleware):
     This middleware extracts the username and password from the Authorization header,
     validates the token type, and sets the user information in the request state.
 
+    Validators may be coroutine functions. Synchronous validators, which usually hash
+    passwords or query a database, are run in the thread pool so they do not block
+    the event loop. Successful validations can be cached for a short time, keyed by
+    a salted hash of the credentials; failed ones are never cached.
+
     Args:
         app (ASGIApp): The ASGI application to wrap with this middleware.
-        validator (Callable[[str, str], bool]): The validator function for validating basic tokens.
-        routes (list[str]): The list of protected routes that require authentication.
+        validator (Callable[[str, str], bool | Awaitable[bool]]): The validator function for validating basic tokens.
+        routes (list[str] | RouteSet): The protected route templates, or a compiled route set
+            shared with other middleware.
+        cache_size (int, optional): The number of validated credentials to cache, 0 to disable the cache. Defaults to 0.
+        cache_ttl (float, optional): The time in seconds validated credentials stay cached. Defaults to 30.0.
     """
 
     def __init__(
         self,
         app,
-        validator: Callable[[str, str], bool],
-        routes: list[str] = [],
+        validator: Callable[[str, str], bool | Awaitable[bool]],
+        routes: list[str] | RouteSet = [],
+        cache_size: int = 0,
+        cache_ttl: float = 30.0,
     ):
         self.validator = validator
         self.protected_routes = routes
+        self.route_set = routes if isinstance(routes, RouteSet) else RouteSet(routes)
+        self._is_async = is_async_callable(validator)
+        self.cache = (
+            TokenCache(cache_size, cache_ttl, salt=os.urandom(16))
+            if cache_size
+            else None
+        )
         super().__init__(app)
 
     async def dispatch(self, request, call_next):
@@ -107,17 +563,37 @@ class BasicTokenMiddleware(BaseHTTPMiddleware):
             Response: The response returned by the next middleware or application.
         """
 
-        if not any(
-            [route for route in self.protected_routes if request.url.path in route]
-        ):
+        if not self.route_set.matches(request.scope):
             return await call_next(request)
 
-        basic, token = request.headers.get("Authorization", "").split(" ")
-        if basic.lower() != "basic":
+        basic, _, token = request.headers.get("Authorization", "").partition(" ")
+        if basic.lower() != "basic" or not token:
             return JSONResponse({"detail": "Invalid token type"}, status_code=401)
-        username, _, password = base64.b64decode(token).decode().partition(":")
-        # call the validator function
-        if not self.validator(username, password):
-            return JSONResponse({"detail": "Invalid credentials"}, status_code=401)
-        request.state.user = {"username": username, "password": password}
+        user = self.cache.get(token) if self.cache is not None else None
+        if user is None:
+            try:
+                credentials = base64.b64decode(token, validate=True).decode()
+            except (binascii.Error, UnicodeDecodeError):
+                return JSONResponse({"detail": "Invalid credentials"}, status_code=401)
+            username, _, password = credentials.partition(":")
+            if not await self.validate(username, password):
+                return JSONResponse({"detail": "Invalid credentials"}, status_code=401)
+            user = {"username": username}
+            if self.cache is not None:
+                self.cache.set(token, user)
+        request.state.user = user
         return await call_next(request)
+
+    async def validate(self, username: str, password: str) -> bool:
+        """Calls the validator without blocking the event loop.
+
+        Args:
+            username (str): The username.
+            password (str): The password.
+
+        Returns:
+            bool: Whether the credentials are valid.
+        """
+        if self._is_async:
+            return bool(await self.validator(username, password))
+        return bool(await run_in_threadpool(self.validator, username, password))
@@ -0,0 +1,329 @@
+"""
+This module contains the cache of rendered template fragments.
+
+Fragments that render the same HTML for many users, like navigation or static
+tables, are wrapped in a ``{% cache %}`` tag. The rendered output is stored under
+a key built from the template name, the fragment name and a stable hash of the
+values the fragment varies on, and reused until its time to live expires:
+
+    {% cache "navigation", user.role, ttl=300 %}
+        ...
+    {% endcache %}
+
+The storage is pluggable. Entries are kept in process by default, or in files
+shared by every worker of a host.
+
+Classes:
+    - FragmentStorage: The base class of fragment storages.
+    - MemoryFragmentStorage: A bounded LRU storage in process memory.
+    - FileFragmentStorage: A bounded storage shared by processes through files.
+    - FragmentCache: Caches rendered fragments in a storage.
+    - FragmentCacheExtension: The Jinja2 ``{% cache %}`` tag.
+
+Functions:
+    - fragment_key: Builds the key of a rendered fragment.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
+from jinja2 import nodes
+from jinja2.ext import Extension
+from jinja2.parser import Parser
+from markupsafe import Markup
+import hashlib
+import inspect
+import orjson
+import os
+import tempfile
+import threading
+import time
+
+# Shared memory on Linux; other systems fall back to the temporary directory.
+SHARED_DIRECTORY = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def fragment_key(template: str | None, name: str, values: Iterable[Any]) -> str:
+    """Builds the key of a rendered fragment.
+
+    The values are serialized with sorted keys, so equal values give the same key
+    in every process.
+
+    Args:
+        template (str | None): The name of the template.
+        name (str): The name of the fragment.
+        values (Iterable[Any]): The values the fragment varies on.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the key parts.
+    """
+    data = orjson.dumps(
+        [template, name, list(values)],
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+    )
+    return hashlib.sha256(data).hexdigest()
+
+
+class FragmentStorage:
+    """The base class of fragment storages."""
+
+    def get(self, key: str) -> str | None:
+        """Returns a stored fragment.
+
+        Args:
+            key (str): The fragment key.
+
+        Returns:
+            str | None: The fragment, or None if it is not stored or expired.
+        """
+        raise NotImplementedError("get method must be implemented")
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        """Stores a fragment.
+
+        Args:
+            key (str): The fragment key.
+            value (str): The rendered fragment.
+            ttl (float): The time in seconds the fragment stays stored.
+        """
+        raise NotImplementedError("set method must be implemented")
+
+    def clear(self) -> None:
+        """Removes every stored fragment."""
+        raise NotImplementedError("clear method must be implemented")
+
+
+class MemoryFragmentStorage(FragmentStorage):
+    """A bounded LRU storage in process memory.
+
+    Args:
+        maxsize (int, optional): The maximum number of stored fragments. Defaults to 1024.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Sync pages render in the threadpool.
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FileFragmentStorage(FragmentStorage):
+    """A bounded storage shared by processes through files.
+
+    Every fragment is a file named after its key, holding its expiry time and its
+    content, and written atomically, so the workers of a host share one cache. The
+    default directory is in ``/dev/shm`` where available, which keeps the files in
+    memory. Reading a fragment marks it as used; when the storage holds more than
+    ``maxsize`` fragments, the least recently used ones are removed.
+
+    Args:
+        directory (str | None, optional): The directory of the fragment files. Defaults to "pypox-fragments" in SHARED_DIRECTORY.
+        maxsize (int, optional): The maximum number of stored fragments. Defaults to 4096.
+        prune_interval (int, optional): The number of writes between size checks. Defaults to 64.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        maxsize: int = 4096,
+        prune_interval: int = 64,
+    ) -> None:
+        self.directory = directory or os.path.join(SHARED_DIRECTORY, "pypox-fragments")
+        self.maxsize = maxsize
+        self.prune_interval = prune_interval
+        self._writes = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                expires_at, _, value = file.read().partition(b"\n")
+        except FileNotFoundError:
+            return None
+        try:
+            if float(expires_at) <= time.time():
+                os.remove(path)
+                return None
+            os.utime(path)
+        except (ValueError, FileNotFoundError):
+            return None
+        return value.decode()
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(f"{time.time() + ttl}\n".encode() + value.encode())
+        os.replace(temporary, self._path(key))
+        self._writes += 1
+        if self._writes % self.prune_interval == 0:
+            self.prune()
+
+    def prune(self) -> None:
+        """Removes the least recently used fragments above the maximum size."""
+        entries = []
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    continue
+        if len(entries) <= self.maxsize:
+            return
+        entries.sort()
+        for _, path in entries[: len(entries) - self.maxsize]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+
+class FragmentCache:
+    """Caches rendered fragments in a storage.
+
+    Args:
+        storage (FragmentStorage | None, optional): The storage. Defaults to a MemoryFragmentStorage.
+        ttl (float, optional): The default time in seconds a fragment stays cached. Defaults to 60.0.
+
+    Attributes:
+        hits (int): The number of fragments answered from the storage.
+        misses (int): The number of fragments that were rendered.
+    """
+
+    def __init__(
+        self, storage: FragmentStorage | None = None, ttl: float = 60.0
+    ) -> None:
+        self.storage = storage if storage is not None else MemoryFragmentStorage()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> str | None:
+        """Returns a cached fragment.
+
+        Args:
+            key (str): The fragment key.
+
+        Returns:
+            str | None: The fragment, or None if it has to be rendered.
+        """
+        value = self.storage.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        """Caches a rendered fragment.
+
+        Args:
+            key (str): The fragment key.
+            value (str): The rendered fragment.
+            ttl (float | None, optional): The time in seconds the fragment stays cached. Defaults to ``ttl``.
+        """
+        self.storage.set(key, value, self.ttl if ttl is None else ttl)
+
+    def clear(self) -> None:
+        """Removes every cached fragment."""
+        self.storage.clear()
+
+
+class FragmentCacheExtension(Extension):
+    """The Jinja2 ``{% cache %}`` tag.
+
+    The tag takes the fragment name, then the values the fragment varies on and
+    an optional ``ttl``. The cache is read from the ``fragment_cache`` attribute
+    of the environment; without one, the fragment is always rendered.
+    """
+
+    tags = {"cache"}
+
+    def __init__(self, environment: Any) -> None:
+        super().__init__(environment)
+        environment.extend(fragment_cache=None)
+
+    def parse(self, parser: Parser) -> nodes.Node:
+        lineno = next(parser.stream).lineno
+        name = parser.parse_expression()
+        values: list[nodes.Expr] = []
+        ttl: nodes.Expr = nodes.Const(None)
+        while parser.stream.skip_if("comma"):
+            if parser.stream.current.test("name:ttl") and parser.stream.look().test(
+                "assign"
+            ):
+                next(parser.stream)
+                next(parser.stream)
+                ttl = parser.parse_expression()
+            else:
+                values.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        arguments = [nodes.Const(parser.name), name, nodes.List(values), ttl]
+        return nodes.CallBlock(
+            self.call_method("_render", arguments), [], [], body
+        ).set_lineno(lineno)
+
+    def _render(
+        self,
+        template: str | None,
+        name: str,
+        values: list[Any],
+        ttl: float | None,
+        caller: Callable[[], Any],
+    ) -> Any:
+        cache: FragmentCache | None = self.environment.fragment_cache  # type: ignore[attr-defined]
+        if cache is None:
+            return caller()
+        key = fragment_key(template, name, values)
+        value = cache.get(key)
+        if value is not None:
+            return Markup(value)
+        rendered = caller()
+        if not inspect.isawaitable(rendered):
+            cache.set(key, rendered, ttl)
+            return rendered
+
+        async def store() -> Any:
+            value = await rendered
+            cache.set(key, value, ttl)
+            return value
+
+        return store()
@@ -0,0 +1,371 @@
+"""
+This module contains the opt-in instrumentation of the request pipeline.
+
+Pypox records the stages of a request as spans: the whole request, route matching,
+every parameter extraction and body parsing in the processor, the handler and each
+message sent as the response. Spans are only created while at least one hook is
+registered on the module-level ``instrumentation``; otherwise every call site skips
+them after a single attribute check.
+
+The active span is tracked in a context variable, so nested spans know their parent
+and code running inside a request can read the span stack.
+
+Classes:
+    - Span: A timed stage of a request.
+    - Hook: The base class of span hooks.
+    - CallbackHook: A hook calling functions when spans start and end.
+    - SpanRecorder: A hook collecting the spans of each request.
+    - OpenTelemetryHook: A hook mirroring spans to OpenTelemetry.
+    - Instrumentation: Creates spans and dispatches them to the hooks.
+    - RequestSpanMiddleware: Records the request and response send spans.
+    - RoutingSpanMiddleware: Records the route matching span.
+
+Functions:
+    - current_span: Returns the active span.
+    - span_stack: Returns the active spans, outermost first.
+    - end_routing_span: Ends the route matching span of a request.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Iterable, Iterator
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import time
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - depends on the environment
+    otel_trace = None
+
+ROUTING_SPAN_KEY = "pypox.routing_span"
+
+_current: ContextVar["Span | None"] = ContextVar("pypox_span", default=None)
+
+
+class Span:
+    """A timed stage of a request.
+
+    Args:
+        name (str): The name of the stage.
+        attributes (dict[str, Any]): The attributes describing the stage.
+        parent (Span | None): The enclosing span.
+
+    Attributes:
+        start_ns (int): The start time from ``time.perf_counter_ns``.
+        end_ns (int | None): The end time, None while the span is active.
+        data (dict[str, Any]): Storage for hooks, e.g. the mirrored OpenTelemetry span.
+    """
+
+    __slots__ = ("name", "attributes", "parent", "start_ns", "end_ns", "data", "_token")
+
+    def __init__(
+        self, name: str, attributes: dict[str, Any], parent: "Span | None"
+    ) -> None:
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: int | None = None
+        self.data: dict[str, Any] = {}
+        self._token: Token | None = None
+
+    @property
+    def duration(self) -> float:
+        """Returns the duration of the span in seconds.
+
+        Returns:
+            float: The duration, up to now while the span is active.
+        """
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    @property
+    def root(self) -> "Span":
+        """Returns the outermost span of the request.
+
+        Returns:
+            Span: The root span.
+        """
+        span = self
+        while span.parent is not None:
+            span = span.parent
+        return span
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, {self.duration * 1e6:.1f}us)"
+
+
+def current_span() -> Span | None:
+    """Returns the active span.
+
+    Returns:
+        Span | None: The innermost active span, or None outside of a span.
+    """
+    return _current.get()
+
+
+def span_stack() -> list[Span]:
+    """Returns the active spans, outermost first.
+
+    Returns:
+        list[Span]: The active spans.
+    """
+    stack = []
+    span = _current.get()
+    while span is not None:
+        stack.append(span)
+        span = span.parent
+    stack.reverse()
+    return stack
+
+
+class Hook:
+    """The base class of span hooks."""
+
+    def on_start(self, span: Span) -> None:
+        """Called when a span starts.
+
+        Args:
+            span (Span): The started span.
+        """
+
+    def on_end(self, span: Span) -> None:
+        """Called when a span ends.
+
+        Args:
+            span (Span): The ended span.
+        """
+
+
+class CallbackHook(Hook):
+    """A hook calling functions when spans start and end.
+
+    Args:
+        on_end (Callable[[Span], None]): Called with every ended span.
+        on_start (Callable[[Span], None] | None, optional): Called with every started span. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        on_end: Callable[[Span], None],
+        on_start: Callable[[Span], None] | None = None,
+    ) -> None:
+        self._on_end = on_end
+        self._on_start = on_start
+
+    def on_start(self, span: Span) -> None:
+        if self._on_start is not None:
+            self._on_start(span)
+
+    def on_end(self, span: Span) -> None:
+        self._on_end(span)
+
+
+class SpanRecorder(Hook):
+    """A hook collecting the spans of each request.
+
+    The ended spans are gathered on their root span and passed to the callback
+    together when the root span ends.
+
+    Args:
+        callback (Callable[[Span, list[Span]], None]): Called with the root span and its ended child spans.
+    """
+
+    def __init__(self, callback: Callable[[Span, list[Span]], None]) -> None:
+        self._callback = callback
+
+    def on_end(self, span: Span) -> None:
+        if span.parent is None:
+            self._callback(span, span.data.pop("pypox.spans", []))
+        else:
+            span.root.data.setdefault("pypox.spans", []).append(span)
+
+
+class OpenTelemetryHook(Hook):
+    """A hook mirroring spans to OpenTelemetry.
+
+    Every pypox span starts an OpenTelemetry span with the same name, attributes
+    and parent, so the stages show up in any configured OpenTelemetry exporter.
+
+    Args:
+        tracer (Any, optional): The OpenTelemetry tracer. Defaults to the "pypox" tracer.
+
+    Raises:
+        RuntimeError: If the OpenTelemetry API is not installed.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        if otel_trace is None:
+            raise RuntimeError(
+                "OpenTelemetryHook requires the opentelemetry-api package"
+            )
+        self._tracer = tracer or otel_trace.get_tracer("pypox")
+
+    def on_start(self, span: Span) -> None:
+        context = None
+        if span.parent is not None and "otel" in span.parent.data:
+            context = otel_trace.set_span_in_context(span.parent.data["otel"])
+        span.data["otel"] = self._tracer.start_span(
+            span.name,
+            context=context,
+            attributes={key: str(value) for key, value in span.attributes.items()},
+        )
+
+    def on_end(self, span: Span) -> None:
+        otel_span = span.data.pop("otel", None)
+        if otel_span is not None:
+            otel_span.end()
+
+
+class Instrumentation:
+    """Creates spans and dispatches them to the hooks.
+
+    Attributes:
+        enabled (bool): Whether any hook is registered. Call sites check it before creating spans.
+        hooks (tuple[Hook, ...]): The registered hooks.
+    """
+
+    def __init__(self, hooks: Iterable[Hook] = ()) -> None:
+        self.hooks: tuple[Hook, ...] = tuple(hooks)
+        self.enabled = bool(self.hooks)
+
+    def add_hook(self, hook: Hook) -> Hook:
+        """Registers a hook.
+
+        Args:
+            hook (Hook): The hook.
+
+        Returns:
+            Hook: The registered hook.
+        """
+        self.hooks = (*self.hooks, hook)
+        self.enabled = True
+        return hook
+
+    def remove_hook(self, hook: Hook) -> None:
+        """Unregisters a hook.
+
+        Args:
+            hook (Hook): The hook.
+        """
+        self.hooks = tuple(
+            registered for registered in self.hooks if registered is not hook
+        )
+        self.enabled = bool(self.hooks)
+
+    def start(self, name: str, **attributes: Any) -> Span:
+        """Starts a span and makes it the active span.
+
+        Args:
+            name (str): The name of the stage.
+            **attributes (Any): The attributes describing the stage.
+
+        Returns:
+            Span: The started span.
+        """
+        span = Span(name, attributes, _current.get())
+        span._token = _current.set(span)
+        for hook in self.hooks:
+            hook.on_start(span)
+        return span
+
+    def end(self, span: Span) -> None:
+        """Ends a span and restores its parent as the active span.
+
+        Args:
+            span (Span): The span to end.
+        """
+        span.end_ns = time.perf_counter_ns()
+        try:
+            _current.reset(span._token)  # type: ignore[arg-type]
+        except ValueError:
+            # The span was started in another context, e.g. before a task switch.
+            _current.set(span.parent)
+        span._token = None
+        for hook in self.hooks:
+            hook.on_end(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Records the enclosed block as a span.
+
+        Args:
+            name (str): The name of the stage.
+            **attributes (Any): The attributes describing the stage.
+
+        Yields:
+            Iterator[Span]: The active span.
+        """
+        span = self.start(name, **attributes)
+        try:
+            yield span
+        finally:
+            self.end(span)
+
+
+instrumentation = Instrumentation()
+
+
+def end_routing_span(scope: Scope) -> None:
+    """Ends the route matching span of a request, if it is still active.
+
+    Route matching ends where the matched route starts handling the request.
+
+    Args:
+        scope (Scope): The request scope.
+    """
+    span = scope.pop(ROUTING_SPAN_KEY, None)
+    if span is not None:
+        instrumentation.end(span)
+
+
+class RequestSpanMiddleware:
+    """Records the request and response send spans.
+
+    Args:
+        app (ASGIApp): The application to wrap.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not instrumentation.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        async def traced_send(message: Message) -> None:
+            with instrumentation.span("response.send", type=message["type"]):
+                await send(message)
+
+        span = instrumentation.start(
+            "request", method=scope["method"], path=scope["path"]
+        )
+        try:
+            await self.app(scope, receive, traced_send)
+        finally:
+            instrumentation.end(span)
+
+
+class RoutingSpanMiddleware:
+    """Records the route matching span.
+
+    The span starts when the router receives the request and ends when the
+    matched route starts handling it, or when the router returns.
+
+    Args:
+        app (ASGIApp): The router to wrap.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not instrumentation.enabled:
+            await self.app(scope, receive, send)
+            return
+        scope[ROUTING_SPAN_KEY] = instrumentation.start("route.match")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            end_routing_span(scope)
@@ -0,0 +1,133 @@
+"""
+This module contains the route manifest used by the file-based routers.
+
+The manifest records the routes discovered in a directory together with the
+modification times of the scanned directories and route files. On the next start
+the recorded entries are reused when none of those times changed, which only costs
+one ``stat`` per directory and file instead of a full directory walk.
+
+Classes:
+    - ManifestEntry: A route file recorded in the manifest.
+    - RouteManifest: A persisted route manifest.
+"""
+
+from typing import Any, Iterable, NamedTuple
+import orjson
+import os
+
+
+class ManifestEntry(NamedTuple):
+    """A route file recorded in the manifest.
+
+    Attributes:
+        route_path (str): The route path generated for the file.
+        method (str): The method, or the router type, mapped to the file name.
+        module_path (str): The path of the module file.
+        mtime_ns (int): The modification time of the module file in nanoseconds.
+    """
+
+    route_path: str
+    method: str
+    module_path: str
+    mtime_ns: int
+
+
+class RouteManifest:
+    """A persisted route manifest.
+
+    A single manifest file can hold the entries of several routers, each stored
+    under its own key.
+
+    Args:
+        path (str): The path of the manifest file.
+
+    Attributes:
+        VERSION (int): The version of the manifest format.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    @property
+    def path(self) -> str:
+        """Returns the path of the manifest file.
+
+        Returns:
+            str: The path of the manifest file.
+        """
+        return self._path
+
+    def read(self) -> dict[str, Any]:
+        """Reads the manifest document.
+
+        Returns:
+            dict[str, Any]: The manifest document, empty if missing, unreadable or outdated.
+        """
+        try:
+            with open(self._path, "rb") as manifest:
+                document = orjson.loads(manifest.read())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+        if not isinstance(document, dict) or document.get("version") != self.VERSION:
+            return {}
+        return document
+
+    def load(self, key: str) -> list[ManifestEntry] | None:
+        """Returns the entries recorded under a key if they are still up to date.
+
+        Args:
+            key (str): The key of the router.
+
+        Returns:
+            list[ManifestEntry] | None: The recorded entries, or None if the manifest is stale.
+        """
+        section = self.read().get("routers", {}).get(key)
+        if not section:
+            return None
+        try:
+            for directory, mtime_ns in section["directories"].items():
+                if os.stat(directory).st_mtime_ns != mtime_ns:
+                    return None
+            entries = [ManifestEntry(*entry) for entry in section["entries"]]
+            for entry in entries:
+                if os.stat(entry.module_path).st_mtime_ns != entry.mtime_ns:
+                    return None
+        except (OSError, KeyError, TypeError):
+            return None
+        return entries
+
+    def save(
+        self,
+        key: str,
+        directories: dict[str, int],
+        entries: Iterable[ManifestEntry],
+    ) -> None:
+        """Records the entries of a router.
+
+        The document is written to a temporary file first and then moved over the
+        manifest, so readers never see a partially written file. Write errors are
+        ignored, e.g. on read-only filesystems: the manifest is only a cache and
+        the router keeps the entries it walked.
+
+        Args:
+            key (str): The key of the router.
+            directories (dict[str, int]): The modification time of every scanned directory.
+            entries (Iterable[ManifestEntry]): The discovered route files.
+        """
+        document = self.read() or {"version": self.VERSION}
+        document.setdefault("routers", {})[key] = {
+            "directories": directories,
+            "entries": [list(entry) for entry in entries],
+        }
+        temporary = f"{self._path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as manifest:
+                manifest.write(orjson.dumps(document))
+            os.replace(temporary, self._path)
+        except OSError:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
@@ -0,0 +1,127 @@
+"""
+This module contains the ASGI app serving the OpenAPI document.
+
+The document is generated once, on the first request, and serialized together with
+its gzip variant and ETag. Every later request sends the same bytes objects with
+precomputed headers, and conditional requests are answered with 304.
+
+Classes:
+    - OpenAPIEndpoint: An ASGI app serving a cached OpenAPI document.
+"""
+
+from typing import Callable, Iterable, NamedTuple
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import BaseRoute
+from starlette.types import Receive, Scope, Send
+from pypox.openapi.generator import OpenAPIGenerator
+import gzip
+import hashlib
+import orjson
+import threading
+
+
+class _Document(NamedTuple):
+    body: bytes
+    gzip_body: bytes
+    etag: bytes
+    headers: list[tuple[bytes, bytes]]
+    gzip_headers: list[tuple[bytes, bytes]]
+    not_modified_headers: list[tuple[bytes, bytes]]
+
+
+class OpenAPIEndpoint:
+    """An ASGI app serving a cached OpenAPI document.
+
+    Args:
+        routes (Callable[[], Iterable[BaseRoute]]): Returns the routes to document.
+        generator (OpenAPIGenerator | None, optional): The document generator. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        routes: Callable[[], Iterable[BaseRoute]],
+        generator: OpenAPIGenerator | None = None,
+    ) -> None:
+        self._routes = routes
+        self.generator = generator or OpenAPIGenerator()
+        self._document: _Document | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def body(self) -> bytes:
+        """Returns the serialized document, building it if needed.
+
+        Returns:
+            bytes: The serialized document.
+        """
+        return self.build().body
+
+    @property
+    def etag(self) -> str:
+        """Returns the entity tag of the document, building it if needed.
+
+        Returns:
+            str: The quoted entity tag.
+        """
+        return self.build().etag.decode()
+
+    def build(self) -> _Document:
+        """Generates and serializes the document if it is not built yet.
+
+        Returns:
+            _Document: The serialized document, its gzip variant and response headers.
+        """
+        with self._lock:
+            if self._document is not None:
+                return self._document
+            document = self.generator.generate(self._routes())
+            body = orjson.dumps(
+                document.model_dump(by_alias=True, exclude_defaults=True)
+            )
+            gzip_body = gzip.compress(body, mtime=0)
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'.encode()
+            common = [
+                (b"content-type", b"application/json"),
+                (b"etag", etag),
+                (b"vary", b"accept-encoding"),
+            ]
+            self._document = _Document(
+                body,
+                gzip_body,
+                etag,
+                [*common, (b"content-length", str(len(body)).encode())],
+                [
+                    *common,
+                    (b"content-encoding", b"gzip"),
+                    (b"content-length", str(len(gzip_body)).encode()),
+                ],
+                [(b"etag", etag), (b"vary", b"accept-encoding")],
+            )
+            return self._document
+
+    def invalidate(self) -> None:
+        """Drops the built document so the next request generates it again."""
+        self._document = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        document = self._document
+        if document is None:
+            document = await run_in_threadpool(self.build)
+        if_none_match = accept_encoding = b""
+        for key, value in scope["headers"]:
+            if key == b"if-none-match":
+                if_none_match = value
+            elif key == b"accept-encoding":
+                accept_encoding = value
+        if document.etag in if_none_match:
+            status, headers, body = 304, document.not_modified_headers, b""
+        elif b"gzip" in accept_encoding:
+            status, headers, body = 200, document.gzip_headers, document.gzip_body
+        else:
+            status, headers, body = 200, document.headers, document.body
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        if scope.get("method") == "HEAD":
+            body = b""
+        await send({"type": "http.response.body", "body": body})
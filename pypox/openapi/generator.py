@@ -0,0 +1,248 @@
+"""
+This module contains the generator building the OpenAPI document of an application.
+
+The generator walks the routes built by the routers and reads the extraction plan
+the processor compiled for each handler, so parameters and request bodies are
+documented from the same annotations that validate the requests.
+
+Classes:
+    - OperationInfo: An operation found in the routes.
+    - OpenAPIGenerator: Builds an OpenAPI document from a list of routes.
+
+Functions:
+    - iterate_operations: Yields the documented operations of a list of routes.
+"""
+
+from typing import Any, Iterable, Iterator, NamedTuple
+from pydantic import BaseModel
+from starlette.endpoints import HTTPEndpoint
+from starlette.routing import BaseRoute, Mount, Route
+from pypox.openapi.main import (
+    Components,
+    Info,
+    MediaType,
+    OpenAPI,
+    Operation,
+    Parameter,
+    PathItem,
+    RequestBody,
+    Response,
+)
+from pypox.radix import RouteTree
+from pypox.router import LazyEndpoint, MethodRoute
+import inspect
+import re
+
+CONVERTOR_REGEX = re.compile(r"{([^:}]+):[^}]+}")
+
+SCHEMA_TYPES: dict[Any, dict[str, str]] = {
+    str: {"type": "string"},
+    int: {"type": "integer"},
+    float: {"type": "number"},
+    bool: {"type": "boolean"},
+    dict: {"type": "object"},
+    list: {"type": "array"},
+}
+
+CONVERTOR_TYPES: dict[str, dict[str, str]] = {
+    "IntegerConvertor": {"type": "integer"},
+    "FloatConvertor": {"type": "number"},
+}
+
+PARAMETER_SOURCES = ("query", "path", "header", "cookie")
+
+HTTP_METHODS = ("GET", "PUT", "POST", "DELETE", "OPTIONS", "HEAD", "PATCH", "TRACE")
+
+
+class OperationInfo(NamedTuple):
+    """An operation found in the routes.
+
+    Attributes:
+        path (str): The OpenAPI path template of the route.
+        method (str): The HTTP method.
+        endpoint (Any): The handler of the method.
+        route (Route): The route the operation belongs to.
+    """
+
+    path: str
+    method: str
+    endpoint: Any
+    route: Route
+
+
+def _http_methods(endpoint: type[HTTPEndpoint]) -> list[str]:
+    return [method for method in HTTP_METHODS if hasattr(endpoint, method.lower())]
+
+
+def iterate_operations(
+    routes: Iterable[BaseRoute], prefix: str = ""
+) -> Iterator[OperationInfo]:
+    """Yields the documented operations of a list of routes.
+
+    Route trees and mounts are walked recursively, lazy endpoints are imported and
+    class endpoints are split into one operation per implemented method. Routes
+    excluded from the schema and WebSocket routes are skipped.
+
+    Args:
+        routes (Iterable[BaseRoute]): The routes to walk.
+        prefix (str, optional): The path prefix of the routes. Defaults to "".
+
+    Yields:
+        Iterator[OperationInfo]: The operations in route order.
+    """
+    for route in routes:
+        if isinstance(route, RouteTree):
+            yield from iterate_operations(route.routes, prefix)
+        elif isinstance(route, Mount):
+            yield from iterate_operations(route.routes, prefix + route.path)
+        elif isinstance(route, Route) and route.include_in_schema:
+            path = CONVERTOR_REGEX.sub(r"{\1}", prefix + route.path)
+            if isinstance(route, MethodRoute):
+                endpoints = dict(route.endpoints)
+                fallback = route.fallback
+                if isinstance(fallback, LazyEndpoint):
+                    fallback = fallback.resolve()
+                if inspect.isclass(fallback) and issubclass(fallback, HTTPEndpoint):
+                    for method in _http_methods(fallback):
+                        endpoints.setdefault(method, getattr(fallback, method.lower()))
+            elif inspect.isclass(route.endpoint) and issubclass(
+                route.endpoint, HTTPEndpoint
+            ):
+                endpoints = {
+                    method: getattr(route.endpoint, method.lower())
+                    for method in _http_methods(route.endpoint)
+                }
+            else:
+                methods = route.methods or {"GET"}
+                endpoints = {
+                    method: route.endpoint
+                    for method in HTTP_METHODS
+                    if method in methods and not (method == "HEAD" and "GET" in methods)
+                }
+            for method, endpoint in endpoints.items():
+                if isinstance(endpoint, LazyEndpoint):
+                    endpoint = endpoint.resolve()
+                yield OperationInfo(path, method, endpoint, route)
+
+
+class OpenAPIGenerator:
+    """Builds an OpenAPI document from a list of routes.
+
+    Parameters are read from the plan of handlers decorated with ``processor``:
+    query, path, header and cookie parameters become operation parameters and
+    Pydantic models become request bodies referencing ``components/schemas``.
+    Path parameters of the route template are always documented, typed from
+    their convertor.
+
+    Args:
+        openapi_version (str, optional): The OpenAPI version. Defaults to "3.0.3".
+        info (Info | None, optional): The information about the application. Defaults to None.
+    """
+
+    def __init__(self, openapi_version: str = "3.0.3", info: Info | None = None):
+        self.openapi_version = openapi_version
+        self.info = info or Info(title="Pypox", version="0.0.1")
+
+    def generate(self, routes: Iterable[BaseRoute]) -> OpenAPI:
+        """Builds the OpenAPI document of the routes.
+
+        Args:
+            routes (Iterable[BaseRoute]): The routes of the application.
+
+        Returns:
+            OpenAPI: The OpenAPI document.
+        """
+        schemas: dict[str, dict] = {}
+        paths: dict[str, PathItem] = {}
+        for operation in iterate_operations(routes):
+            item = paths.setdefault(operation.path, PathItem())
+            setattr(
+                item,
+                operation.method.lower(),
+                self.operation(operation, schemas),
+            )
+        return OpenAPI(
+            openapi=self.openapi_version,
+            info=self.info,
+            paths=paths,
+            components=Components(schemas=schemas) if schemas else None,
+        )
+
+    def operation(self, info: OperationInfo, schemas: dict[str, dict]) -> Operation:
+        """Builds the operation of a handler.
+
+        Args:
+            info (OperationInfo): The operation found in the routes.
+            schemas (dict[str, dict]): The component schemas, extended with the models of the handler.
+
+        Returns:
+            Operation: The operation.
+        """
+        parameters: dict[tuple[str, str], Parameter] = {}
+        for name, convertor in info.route.param_convertors.items():
+            parameters[("path", name)] = Parameter(
+                name=name,
+                in_="path",
+                required=True,
+                schema_=CONVERTOR_TYPES.get(
+                    type(convertor).__name__, {"type": "string"}
+                ),
+            )
+        request_body = None
+        for plan in getattr(info.endpoint, "plan", ()):
+            if plan.source in PARAMETER_SOURCES:
+                name = plan.alias if plan.source == "header" else plan.name
+                parameters[(plan.source, name)] = Parameter(
+                    name=name,
+                    in_=plan.source,
+                    required=True if plan.source == "path" else None,
+                    schema_=SCHEMA_TYPES.get(plan.converter, {"type": "string"}),
+                )
+            elif plan.source in ("body", "form"):
+                request_body = self.request_body(plan.source, plan.annotation, schemas)
+        doc = inspect.getdoc(info.endpoint)
+        summary = doc.split("\n\n")[0].strip() if doc else None
+        operation_id = re.sub(r"\W+", "_", f"{info.method}{info.path}").strip("_")
+        return Operation(
+            summary=summary,
+            description=doc if doc and doc != summary else None,
+            operationId=operation_id.lower(),
+            parameters=list(parameters.values()) or None,
+            requestBody=request_body,
+            responses={"200": Response(description="Successful Response")},
+        )
+
+    def request_body(
+        self, source: str, annotation: Any, schemas: dict[str, dict]
+    ) -> RequestBody:
+        """Builds the request body of a body or form parameter.
+
+        Args:
+            source (str): The source of the parameter, "body" or "form".
+            annotation (Any): The annotation of the parameter.
+            schemas (dict[str, dict]): The component schemas, extended with the model.
+
+        Returns:
+            RequestBody: The request body.
+        """
+        if source == "form":
+            return RequestBody(
+                content={
+                    "application/x-www-form-urlencoded": MediaType(
+                        schema_={"type": "object"}
+                    )
+                },
+                required=True,
+            )
+        if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+            schema = annotation.model_json_schema(
+                ref_template="#/components/schemas/{model}"
+            )
+            schemas.update(schema.pop("$defs", {}))
+            schemas[annotation.__name__] = schema
+            schema = {"$ref": f"#/components/schemas/{annotation.__name__}"}
+        else:
+            schema = {"type": "object"}
+        return RequestBody(
+            content={"application/json": MediaType(schema_=schema)}, required=True
+        )
@@ -4,7 +4,7 @@ from typing import Any, Optional
 from starlette.routing import Route
 
 try:
-    from pydantic import BaseModel
+    from pydantic import BaseModel, ConfigDict, Field
 except ImportError as e:
     raise e
 
@@ -134,12 +134,15 @@ class Response(BaseModel):
 
 
 class Parameter(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
     name: Optional[str] = ""
-    in_: Optional[str] = ""
+    in_: Optional[str] = Field("", alias="in")
     description: Optional[str] = ""
     required: Optional[bool] = None
     deprecated: Optional[bool] = None
     allowEmptyValue: Optional[bool] = None
+    schema_: Optional[dict] = Field(None, alias="schema")
 
 
 class Header(Parameter):
@@ -147,7 +150,9 @@ class Header(Parameter):
 
 
 class MediaType(BaseModel):
-    schema_: Optional[dict] = None
+    model_config = ConfigDict(populate_by_name=True)
+
+    schema_: Optional[dict] = Field(None, alias="schema")
     example: Optional[Any] = None
     examples: Optional[dict[str, "Example | Reference"]] = None
     encoding: Optional[dict[str, "Encoding"]] = None
@@ -175,10 +180,12 @@ class RequestBody(BaseModel):
 
 
 class SecurityScheme(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
     type: Optional[str] = ""
     description: Optional[str] = ""
     name: Optional[str] = ""
-    in_: Optional[str] = ""
+    in_: Optional[str] = Field("", alias="in")
     _scheme: Optional[str] = ""
     bearerFormat: Optional[str] = ""
     flows: Optional[dict] = None
@@ -1,9 +1,10 @@
 from functools import wraps
 import inspect
-from typing import Any, Callable, Awaitable
+from typing import Any, Callable, Awaitable, NamedTuple
 from starlette.requests import Request
 from starlette.responses import Response
-import asyncio
+from pypox.responses import PypoxJSONResponse
+from pypox.instrumentation import end_routing_span, instrumentation
 from pypox.processing.validators.base import Validator
 from pypox.processing.validators.form import FormValidator
 from pypox.processing.validators.json import JSONValidator
@@ -12,15 +13,30 @@ from pypox.processing.validators.path import PathValidator
 from pypox.processing.validators.header import HeaderValidator
 from pypox.processing.validators.cookies import CookieValidator
 from pypox.processing.validators.htmx import HTMXValidator
+from pypox.processing.validators.model import RequestValidationError
+from pypox.processing.registry import (
+    DEFAULT_VALIDATORS,
+    ValidatorRegistry,
+    default_registry,
+)
 
 
 def processor(
     validators: list = [],
+    registry: ValidatorRegistry | None = None,
+    response_class: type[Response] = PypoxJSONResponse,
 ) -> Callable:
     """Decorator function that adds validation to a request handler function.
 
+    The extraction plan of the handler is compiled once, when the decorator is
+    applied, so each request only runs the precomputed extractors. Handlers
+    returning a dict or a list are rendered with the response class, and so are
+    the errors of request bodies that fail model validation, with status 422.
+
     Args:
         validators (list, optional): A list of additional validators to apply. Defaults to [].
+        registry (ValidatorRegistry | None, optional): The registry used to resolve validators. Defaults to the default registry.
+        response_class (type[Response], optional): The response class for dict and list returns. Defaults to PypoxJSONResponse.
 
     Returns:
         Callable: A decorated request handler function.
@@ -30,40 +46,109 @@ def processor(
         func: Callable,
     ) -> Callable[[Request], Awaitable[Response | Response]]:
 
+        pypox_processor = PypoxProcessor(func, validators, registry)
+        validate = pypox_processor.validate
+        is_coroutine = inspect.iscoroutinefunction(func)
+
         @wraps(func)
         async def wrapper(request: Request) -> Response:
-            params = await PypoxProcessor(
-                func,
-                [
-                    QueryValidator,
-                    PathValidator,
-                    HeaderValidator,
-                    CookieValidator,
-                    JSONValidator,
-                    FormValidator,
-                ]
-                + validators,
-            ).validate(
-                request,
-            )
-            if inspect.iscoroutinefunction(func):
-                return await func(**params)
+            if instrumentation.enabled:
+                return await traced(request)
+            try:
+                params = await validate(request)
+            except RequestValidationError as exc:
+                return response_class({"detail": exc.errors}, status_code=422)
+            if is_coroutine:
+                response = await func(**params)
             else:
-                return func(**params)
+                response = func(**params)
+            if isinstance(response, (dict, list)):
+                return response_class(response)
+            return response
+
+        async def traced(request: Request) -> Response:
+            end_routing_span(request.scope)
+            try:
+                params = await pypox_processor.validate_traced(request)
+            except RequestValidationError as exc:
+                return response_class({"detail": exc.errors}, status_code=422)
+            with instrumentation.span("handler", endpoint=func.__qualname__):
+                if is_coroutine:
+                    response = await func(**params)
+                else:
+                    response = func(**params)
+                if isinstance(response, (dict, list)):
+                    return response_class(response)
+                return response
 
+        wrapper.plan = pypox_processor.plan  # type: ignore
         return wrapper
 
     return decorator
 
 
+class ParameterPlan(NamedTuple):
+    """The precompiled extraction step of a single endpoint parameter.
+
+    Attributes:
+        name (str): The name of the parameter in the endpoint signature.
+        source (str): The part of the request the value is read from.
+        annotation (Any): The annotation of the parameter.
+        alias (str): The dash variant of the name, looked up before the name itself.
+        converter (Callable | None): The callable that converts the raw value.
+        extractor (Callable[[Request], Any]): The callable that returns the value for a request.
+        is_async (bool): Whether the extractor returns an awaitable.
+    """
+
+    name: str
+    source: str
+    annotation: Any
+    alias: str
+    converter: Callable | None
+    extractor: Callable[[Request], Any]
+    is_async: bool
+
+
+def _request_extractor(request: Request) -> Request:
+    return request
+
+
+def _is_typed(validator: type[Validator]) -> bool:
+    """Returns whether a validator can be resolved through the registry.
+
+    Only the types a class declares itself count, and overriding ``validate``
+    opts out: legacy validators subclassing a built-in one inherit its types but
+    decide in ``validate`` which annotations they handle, so they are probed.
+    """
+    return (
+        bool(validator.__dict__.get("types"))
+        and validator.validate is Validator.validate
+    )
+
+
+def _probe_extractor(validators: list[Validator]) -> Callable:
+    async def extractor(request: Request) -> Any:
+        for validator_obj in validators:
+            data = await validator_obj(request)
+            if data:
+                return data[validator_obj.name]
+        return None
+
+    return extractor
+
+
 class PypoxProcessor:
     """A class representing a Pypox processor.
 
     This class is responsible for processing requests and validating parameters.
+    The parameters of the function are resolved to their validators once, when
+    the processor is created, and kept as an immutable extraction plan.
 
     Attributes:
         _validators (list): A list of validators to be applied to the parameters.
+        _registry (ValidatorRegistry): The registry used to resolve the validator of each annotation.
         _func (Callable): The function to be executed for processing the request.
+        _plan (tuple[ParameterPlan, ...]): The compiled extraction plan of the function.
 
     """
 
@@ -71,16 +156,92 @@ class PypoxProcessor:
         self,
         func: Callable[[Any], Awaitable[Response] | Response],
         validators: list = [],
+        registry: ValidatorRegistry | None = None,
     ) -> None:
         self._validators = validators
+        registry = registry or default_registry
+        typed = [validator for validator in validators if _is_typed(validator)]
+        self._registry = registry.extend(typed) if typed else registry
+        self._probes = [
+            validator for validator in validators if not _is_typed(validator)
+        ]
         self._func = func
+        self._plan = self.compile(func)
+
+    @property
+    def plan(self) -> tuple[ParameterPlan, ...]:
+        """Returns the compiled extraction plan.
+
+        Returns:
+            tuple[ParameterPlan, ...]: One step per extracted parameter, in signature order.
+        """
+        return self._plan
+
+    def compile(
+        self, func: Callable[[Any], Awaitable[Response] | Response]
+    ) -> tuple[ParameterPlan, ...]:
+        """Compiles the extraction plan of a function.
+
+        Args:
+            func (Callable): The function whose signature is compiled.
+
+        Returns:
+            tuple[ParameterPlan, ...]: The extraction plan of the function.
+        """
+        plan: list[ParameterPlan] = []
+        for name, parameter in inspect.signature(func).parameters.items():
+            step = self.compile_parameter(name, parameter.annotation)
+            if step:
+                plan.append(step)
+        return tuple(plan)
+
+    def compile_parameter(self, name: str, annotation: Any) -> ParameterPlan | None:
+        """Resolves the extraction step of a single parameter.
+
+        Annotations registered in the registry resolve to their validator with a
+        single lookup. Validators without types of their own, or overriding
+        ``validate``, are probed in order on each request.
+
+        Args:
+            name (str): The name of the parameter.
+            annotation (Any): The annotation of the parameter.
+
+        Returns:
+            ParameterPlan | None: The extraction step, or None if nothing handles the parameter.
+        """
+        if annotation is Request:
+            return ParameterPlan(
+                name, "request", annotation, name, None, _request_extractor, False
+            )
+        validator = self._registry.resolve(annotation)
+        if validator:
+            validator_obj: Validator = validator(name, annotation)
+            return ParameterPlan(
+                name,
+                validator.source,
+                annotation,
+                validator_obj.alias,
+                validator_obj.converter,
+                validator_obj.extract,
+                inspect.iscoroutinefunction(validator_obj.extract),
+            )
+        if self._probes:
+            return ParameterPlan(
+                name,
+                "custom",
+                annotation,
+                name,
+                None,
+                _probe_extractor([probe(name, annotation) for probe in self._probes]),
+                True,
+            )
+        return None
 
     async def validate(self, request: Request) -> dict:
         """Validates the request and returns the parameters.
 
-        This method validates the given request by iterating through the parameters
-        of the associated function and applying the registered validators. It returns
-        a dictionary of parameters that have been validated.
+        This method runs the compiled extraction plan against the given request.
+        It returns a dictionary of parameters that have been found in the request.
 
         Args:
             request (Request): The request object to be validated.
@@ -90,21 +251,33 @@ class PypoxProcessor:
 
         """
         params = {}
-        async for name, parameter in self.iterate_params(self._func):
-            if parameter.annotation == Request:
-                params[name] = request
-                break
-            for validator in self._validators:
-                validator_obj: Validator = validator(name, parameter.annotation)
-                data = await validator_obj(request)
-                if data:
-                    params.update(data)
-                    break
+        for step in self._plan:
+            value = step.extractor(request)
+            if step.is_async:
+                value = await value
+            if value is not None:
+                params[step.name] = value
         return params
 
-    async def iterate_params(
-        self, func: Callable[[Any], Awaitable[Response] | Response]
-    ):
-        for name, parameter in inspect.signature(func).parameters.items():
-            yield name, parameter
-            await asyncio.sleep(0)
+    async def validate_traced(self, request: Request) -> dict:
+        """Validates the request like ``validate``, recording a span per parameter.
+
+        Parameters read from the body are recorded as ``parse.body`` spans, the
+        others as ``extract`` spans.
+
+        Args:
+            request (Request): The request object to be validated.
+
+        Returns:
+            dict: A dictionary containing the validated parameters.
+        """
+        params = {}
+        for step in self._plan:
+            name = "parse.body" if step.source in ("body", "form") else "extract"
+            with instrumentation.span(name, parameter=step.name, source=step.source):
+                value = step.extractor(request)
+                if step.is_async:
+                    value = await value
+            if value is not None:
+                params[step.name] = value
+        return params
@@ -0,0 +1,132 @@
+"""
+This module contains the validator registry used by the Pypox processor.
+
+The registry maps each parameter annotation to the one validator that handles it,
+so resolving the validator of a parameter is a single dictionary lookup.
+
+Classes:
+    - ValidatorRegistry: A mapping of annotation types to validator classes.
+
+Functions:
+    - register_validator: Registers a validator in the default registry.
+"""
+
+from typing import Any, Callable, Iterable, Iterator
+from pypox.processing.validators.base import Validator
+from pypox.processing.validators.form import FormValidator
+from pypox.processing.validators.json import JSONValidator
+from pypox.processing.validators.query import QueryValidator
+from pypox.processing.validators.path import PathValidator
+from pypox.processing.validators.header import HeaderValidator
+from pypox.processing.validators.cookies import CookieValidator
+from pypox.processing.validators.model import ModelValidator
+
+
+DEFAULT_VALIDATORS: list[type[Validator]] = [
+    QueryValidator,
+    PathValidator,
+    HeaderValidator,
+    CookieValidator,
+    JSONValidator,
+    FormValidator,
+    ModelValidator,
+]
+
+
+class ValidatorRegistry:
+    """A mapping of annotation types to validator classes.
+
+    Args:
+        validators (Iterable[type[Validator]], optional): Validators registered with their declared types. Defaults to ().
+
+    Attributes:
+        _types (dict[Any, type[Validator]]): The validator of each registered annotation.
+    """
+
+    def __init__(self, validators: Iterable[type[Validator]] = ()) -> None:
+        self._types: dict[Any, type[Validator]] = {}
+        for validator in validators:
+            self.register(validator)
+
+    def register(
+        self, validator: type[Validator], types: Iterable[Any] | None = None
+    ) -> type[Validator]:
+        """Registers a validator for the given types.
+
+        A type that is already registered is overridden by the new validator.
+
+        Args:
+            validator (type[Validator]): The validator class.
+            types (Iterable[Any] | None, optional): The annotations to register. Defaults to the validator's ``types``.
+
+        Returns:
+            type[Validator]: The registered validator.
+        """
+        for _type in validator.types if types is None else types:
+            self._types[_type] = validator
+        return validator
+
+    def resolve(self, annotation: Any) -> type[Validator] | None:
+        """Returns the validator registered for an annotation.
+
+        Classes that are not registered themselves resolve to the validator of
+        their nearest registered base class, e.g. Pydantic models.
+
+        Args:
+            annotation (Any): The annotation of a parameter.
+
+        Returns:
+            type[Validator] | None: The validator, or None if the annotation is not registered.
+        """
+        validator = self._types.get(annotation)
+        if validator is None and isinstance(annotation, type):
+            for base in annotation.__mro__[1:]:
+                validator = self._types.get(base)
+                if validator:
+                    break
+        return validator
+
+    def extend(self, validators: Iterable[type[Validator]]) -> "ValidatorRegistry":
+        """Returns a copy of the registry with additional validators registered.
+
+        Args:
+            validators (Iterable[type[Validator]]): The validators to register.
+
+        Returns:
+            ValidatorRegistry: The new registry.
+        """
+        registry = ValidatorRegistry()
+        registry._types = dict(self._types)
+        for validator in validators:
+            registry.register(validator)
+        return registry
+
+    def __contains__(self, annotation: Any) -> bool:
+        return annotation in self._types
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._types)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+
+default_registry = ValidatorRegistry(DEFAULT_VALIDATORS)
+
+
+def register_validator(
+    *types: Any,
+) -> Callable[[type[Validator]], type[Validator]]:
+    """Decorator that registers a validator in the default registry.
+
+    Args:
+        *types (Any): The annotations to register. Defaults to the validator's ``types``.
+
+    Returns:
+        Callable[[type[Validator]], type[Validator]]: The class decorator.
+    """
+
+    def decorator(validator: type[Validator]) -> type[Validator]:
+        return default_registry.register(validator, types or None)
+
+    return decorator
@@ -1,19 +1,52 @@
 from abc import ABC
+import inspect
+from typing import Any
 from starlette.requests import Request
 
 
 class Validator(ABC):
+    """Base class for request parameter validators.
+
+    A validator is built once per endpoint parameter. Subclasses declare the
+    annotations they handle in ``types`` and implement ``extract``, which is
+    called on every request without any further type checks.
+
+    Attributes:
+        types (tuple[type, ...]): The annotations handled by the validator.
+        source (str): The part of the request the value is read from.
+    """
+
+    types: tuple[type, ...] = ()
+    source: str = "custom"
 
     def __init__(self, name: str, _type: type) -> None:
         self._name = name
         self._type = _type
+        self._alias = name.replace("_", "-")
+        self._converter = getattr(_type, "__supertype__", _type)
 
     @property
     def name(self) -> str:
         return self._name
 
-    async def validate(self, _type: type, request: Request) -> None:
-        raise NotImplementedError("validate method must be implemented")
+    @property
+    def alias(self) -> str:
+        return self._alias
+
+    @property
+    def converter(self) -> Any:
+        return self._converter
+
+    def extract(self, request: Request) -> Any:
+        raise NotImplementedError("extract method must be implemented")
+
+    async def validate(self, _type: type, request: Request) -> Any:
+        if _type not in self.types:
+            return None
+        value = self.extract(request)
+        if inspect.isawaitable(value):
+            value = await value
+        return value
 
     async def __call__(self, request: Request) -> dict:
         value = await self.validate(self._type, request)
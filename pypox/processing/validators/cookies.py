@@ -6,13 +6,15 @@ from pypox.processing.validators.base import Validator
 
 class CookieValidator(Validator):
 
-    async def validate(self, _type: type, request: Request) -> None:
-        if _type not in [CookieStr, CookieInt, CookieFloat, CookieBool]:
-            return None
-        if self._name.replace("_", "-") in request.cookies:
-            value = request.cookies.get(self._name.replace("_", "-"))
+    types = (CookieStr, CookieInt, CookieFloat, CookieBool)
+    source = "cookie"
+
+    def extract(self, request: Request) -> Any:
+        cookies = request.cookies
+        if self._alias in cookies:
+            value = cookies.get(self._alias)
         else:
-            value = request.cookies.get(self._name)
+            value = cookies.get(self._name)
         if not value:
             return None
-        return _type.__supertype__(value)
+        return self._converter(value)
@@ -6,7 +6,8 @@ from pypox.processing.validators.base import Validator
 
 class FormValidator(Validator):
 
-    async def validate(self, _type: type, request: Request) -> None:
-        if not _type in [BodyForm]:
-            return None
-        return _type.__supertype__(await request.form())
+    types = (BodyForm,)
+    source = "form"
+
+    async def extract(self, request: Request) -> Any:
+        return self._converter(await request.form())
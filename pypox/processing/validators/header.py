@@ -6,16 +6,15 @@ from pypox.processing.validators.base import Validator
 
 class HeaderValidator(Validator):
 
-    def __init__(self, name: str, _type: type) -> None:
-        super().__init__(name, _type)
+    types = (HeaderStr, HeaderInt, HeaderFloat, HeaderBool)
+    source = "header"
 
-    async def validate(self, _type: type, request: Request) -> None:
-        if _type not in [HeaderStr, HeaderInt, HeaderFloat, HeaderBool]:
-            return None
-        if self._name.replace("_", "-") in request.headers:
-            value = request.headers.get(self._name.replace("_", "-"))
+    def extract(self, request: Request) -> Any:
+        headers = request.headers
+        if self._alias in headers:
+            value = headers.get(self._alias)
         else:
-            value = request.headers.get(self._name)
+            value = headers.get(self._name)
         if not value:
             return None
-        return _type.__supertype__(value)
+        return self._converter(value)
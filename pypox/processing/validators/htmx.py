@@ -19,17 +19,6 @@ from jinja2 import BaseLoader, BytecodeCache, Environment, FileSystemLoader, Und
 from starlette.responses import HTMLResponse
 
 
-class HTMXValidator(HeaderValidator):
-
-    def __init__(self, name: str, _type: Type) -> None:
-        super().__init__(name, _type)
-
-    async def validate(self, _type: Type, request: Request) -> None:
-        if _type not in [HTMXHeaders, HTMXResponseHeaders]:
-            return None
-        return _type(**request.headers)
-
-
 class HTMXHeaders(BaseModel):
 
     boosted: str = Field(default="false", alias="hx-boosted")
@@ -49,6 +38,79 @@ class HTMXHeaders(BaseModel):
             raise ValueError("Request must be True")
 
 
+class HTMXHeadersView:
+    """A lazy view of the HTMX request headers.
+
+    The view keeps the raw ASGI header list and reads the ``hx-*`` headers from
+    it on the first attribute access, without validation. ``model`` builds the
+    ``HTMXHeaders`` model from the same headers when it is needed.
+
+    Args:
+        raw_headers (list[tuple[bytes, bytes]]): The raw ASGI headers of the request.
+    """
+
+    __slots__ = ("_raw_headers", "_values")
+
+    def __init__(self, raw_headers: list[tuple[bytes, bytes]]) -> None:
+        self._raw_headers = raw_headers
+        self._values: dict[str, str] | None = None
+
+    @property
+    def values(self) -> dict[str, str]:
+        """Returns the HTMX headers sent with the request.
+
+        Returns:
+            dict[str, str]: The values of the ``hx-*`` headers by header name.
+        """
+        if self._values is None:
+            self._values = {
+                key.decode("latin-1"): value.decode("latin-1")
+                for key, value in self._raw_headers
+                if key.startswith(b"hx-")
+            }
+        return self._values
+
+    @property
+    def boosted(self) -> str:
+        return self.values.get("hx-boosted", "false")
+
+    @property
+    def current_url(self) -> str:
+        return self.values.get("hx-current-url", "")
+
+    @property
+    def history_restored(self) -> str:
+        return self.values.get("hx-history-restored", "false")
+
+    @property
+    def prompt(self) -> str:
+        return self.values.get("hx-prompt", "false")
+
+    @property
+    def request(self) -> str:
+        return self.values.get("hx-request", "false")
+
+    @property
+    def target(self) -> str:
+        return self.values.get("hx-target", "")
+
+    @property
+    def trigger_name(self) -> str:
+        return self.values.get("hx-trigger-name", "")
+
+    @property
+    def trigger(self) -> str:
+        return self.values.get("hx-trigger", "")
+
+    def model(self) -> HTMXHeaders:
+        """Validates the HTMX headers.
+
+        Returns:
+            HTMXHeaders: The validated headers.
+        """
+        return HTMXHeaders(**self.values)
+
+
 class HTMXResponseHeaders(BaseModel):
     location: str = Field(
         default="",
@@ -94,3 +156,15 @@ class HTMXResponseHeaders(BaseModel):
         default="",
         alias="hx-trigger-after-swap",
     )
+
+
+class HTMXValidator(HeaderValidator):
+
+    types = (HTMXHeaders, HTMXHeadersView, HTMXResponseHeaders)
+
+    def extract(self, request: Request) -> Any:
+        if self._type is HTMXHeadersView:
+            return HTMXHeadersView(request.scope["headers"])
+        if self._type is HTMXHeaders:
+            return HTMXHeadersView(request.scope["headers"]).model()
+        return self._type(**request.headers)
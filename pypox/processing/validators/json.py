@@ -1,12 +1,18 @@
+from starlette.exceptions import HTTPException
 from starlette.requests import Request
 from typing import Any
 from pypox._types import BodyDict
 from pypox.processing.validators.base import Validator
+import orjson
 
 
 class JSONValidator(Validator):
 
-    async def validate(self, _type: type, request: Request) -> None:
-        if _type not in [BodyDict]:
-            return None
-        return _type.__supertype__(await request.json())
+    types = (BodyDict,)
+    source = "body"
+
+    async def extract(self, request: Request) -> Any:
+        try:
+            return self._converter(orjson.loads(await request.body()))
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
@@ -0,0 +1,64 @@
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from typing import Any, Callable
+from pydantic import BaseModel, ValidationError
+from pypox.processing.validators.base import Validator
+import orjson
+
+
+class RequestValidationError(HTTPException):
+    """Raised when the body of a request does not match its model.
+
+    The processor renders it as a JSON 422 response listing the errors.
+
+    Args:
+        errors (list[dict[str, Any]]): The validation errors, as returned by pydantic.
+
+    Attributes:
+        errors (list[dict[str, Any]]): The validation errors.
+    """
+
+    def __init__(self, errors: list[dict[str, Any]]) -> None:
+        super().__init__(status_code=422, detail="Request validation failed")
+        self.errors = errors
+
+
+_json_validators: dict[type[BaseModel], Callable[[bytes], Any]] = {}
+
+
+def compile_model(model: type[BaseModel]) -> Callable[[bytes], Any]:
+    """Returns the cached JSON validator of a Pydantic model.
+
+    The model is rebuilt once if its schema is not complete yet, so forward
+    references are resolved before the first request.
+
+    Args:
+        model (type[BaseModel]): The Pydantic model.
+
+    Returns:
+        Callable[[bytes], Any]: The pydantic-core validator parsing raw JSON into the model.
+    """
+    validate_json = _json_validators.get(model)
+    if validate_json is None:
+        if not model.__pydantic_complete__:
+            model.model_rebuild()
+        validate_json = model.__pydantic_validator__.validate_json
+        _json_validators[model] = validate_json
+    return validate_json
+
+
+class ModelValidator(Validator):
+
+    types = (BaseModel,)
+    source = "body"
+
+    def __init__(self, name: str, _type: type) -> None:
+        super().__init__(name, _type)
+        self._validate_json = compile_model(_type)
+
+    async def extract(self, request: Request) -> Any:
+        try:
+            return self._validate_json(await request.body())
+        except ValidationError as exc:
+            # json() serializes error contexts that may hold exception objects.
+            raise RequestValidationError(orjson.loads(exc.json(include_url=False)))
@@ -6,16 +6,15 @@ from pypox.processing.validators.base import Validator
 
 class PathValidator(Validator):
 
-    def __init__(self, name: str, _type: type) -> None:
-        super().__init__(name, _type)
+    types = (PathStr, PathInt, PathFloat, PathBool)
+    source = "path"
 
-    async def validate(self, _type: type, request: Request) -> None:
-        if _type not in [PathStr, PathInt, PathFloat, PathBool]:
-            return None
-        if self._name.replace("_", "-") in request.path_params:
-            value = request.path_params.get(self._name.replace("_", "-"))
+    def extract(self, request: Request) -> Any:
+        path_params = request.path_params
+        if self._alias in path_params:
+            value = path_params.get(self._alias)
         else:
-            value = request.path_params.get(self._name)
+            value = path_params.get(self._name)
         if not value:
             return None
-        return _type.__supertype__(value)
+        return self._converter(value)
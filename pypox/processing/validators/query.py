@@ -6,16 +6,15 @@ from pypox.processing.validators.base import Validator
 
 class QueryValidator(Validator):
 
-    def __init__(self, name: str, _type: type) -> None:
-        super().__init__(name, _type)
+    types = (QueryStr, QueryInt, QueryFloat, QueryBool)
+    source = "query"
 
-    async def validate(self, _type: type, request: Request) -> None:
-        if _type not in [QueryStr, QueryInt, QueryFloat, QueryBool]:
-            return None
-        if self._name.replace("_", "-") in request.query_params:
-            value = request.query_params.get(self._name.replace("_", "-"))
+    def extract(self, request: Request) -> Any:
+        query_params = request.query_params
+        if self._alias in query_params:
+            value = query_params.get(self._alias)
         else:
-            value = request.query_params.get(self._name)
+            value = query_params.get(self._name)
         if not value:
             return None
-        return _type.__supertype__(value)
+        return self._converter(value)
@@ -0,0 +1,360 @@
+"""
+This module contains the radix tree used to match file-based routes.
+
+Route templates are split into path segments. Runs of static segments are stored as
+compressed edges and ``{param}`` segments as parameter edges, so a path is matched by
+walking the tree once, in time bounded by its depth instead of the number of routes.
+
+Classes:
+    - RadixNode: A node of the radix tree.
+    - RadixTree: A radix tree mapping route templates to values.
+    - RouteLeaf: The routes registered for one route template.
+    - RouteTree: A route matching its child routes through a radix tree.
+"""
+
+from typing import Any, Iterator, NamedTuple, Sequence
+from starlette._utils import get_route_path
+from starlette.convertors import CONVERTOR_TYPES, Convertor
+from starlette.routing import BaseRoute, Match, NoMatchFound, Route, WebSocketRoute
+from starlette.datastructures import URLPath
+from starlette.types import Receive, Scope, Send
+import re
+
+
+PARAM_REGEX = re.compile(r"^{([a-zA-Z_][a-zA-Z0-9_]*)(?::([a-zA-Z_][a-zA-Z0-9_]*))?}$")
+
+
+class Param(NamedTuple):
+    """A parameter segment of a route template.
+
+    Attributes:
+        name (str): The name of the parameter.
+        convertor (str): The name of the Starlette convertor.
+    """
+
+    name: str
+    convertor: str
+
+
+class ParamEdge(NamedTuple):
+    """An edge matching one parameter segment.
+
+    Attributes:
+        name (str): The name of the parameter.
+        convertor_name (str): The name of the Starlette convertor.
+        convertor (Convertor): The convertor of the parameter value.
+        pattern (re.Pattern | None): The pattern a segment must match, None for any non-empty segment.
+        node (RadixNode): The node the edge leads to.
+    """
+
+    name: str
+    convertor_name: str
+    convertor: Convertor
+    pattern: re.Pattern | None
+    node: "RadixNode"
+
+
+def parse_template(template: str) -> list[str | Param]:
+    """Splits a route template into static segments and parameters.
+
+    A trailing slash is kept as a final empty segment, so ``/items`` and ``/items/``
+    remain distinct like they are for Starlette routes.
+
+    Args:
+        template (str): The route template.
+
+    Raises:
+        ValueError: If a segment mixes text and parameters or uses the path convertor.
+
+    Returns:
+        list[str | Param]: The tokens of the template.
+    """
+    tokens: list[str | Param] = []
+    for segment in template.split("/")[1:]:
+        match = PARAM_REGEX.match(segment)
+        if match:
+            name, convertor = match.group(1), match.group(2) or "str"
+            if convertor not in CONVERTOR_TYPES or convertor == "path":
+                raise ValueError(f"Unsupported convertor {convertor!r} in {template}")
+            tokens.append(Param(name, convertor))
+        elif "{" in segment or "}" in segment:
+            raise ValueError(f"Unsupported segment {segment!r} in {template}")
+        else:
+            tokens.append(segment)
+    return tokens
+
+
+class RadixNode:
+    """A node of the radix tree.
+
+    Attributes:
+        prefix (tuple[str, ...]): The static segments of the edge leading to the node.
+        children (dict[str, RadixNode]): The static children, keyed by the first segment of their prefix.
+        params (list[ParamEdge]): The parameter edges, tried in insertion order.
+        value (Any): The value stored for the template ending at the node.
+    """
+
+    __slots__ = ("prefix", "children", "params", "value")
+
+    def __init__(self, prefix: tuple[str, ...] = ()) -> None:
+        self.prefix = prefix
+        self.children: dict[str, RadixNode] = {}
+        self.params: list[ParamEdge] = []
+        self.value: Any = None
+
+
+class RadixTree:
+    """A radix tree mapping route templates to values.
+
+    Static segments take precedence over parameters. When several templates match
+    a path, they are yielded in that precedence order.
+    """
+
+    def __init__(self) -> None:
+        self.root = RadixNode()
+
+    def insert(self, template: str) -> RadixNode:
+        """Returns the node of a template, creating the missing nodes.
+
+        Args:
+            template (str): The route template.
+
+        Returns:
+            RadixNode: The node the template ends at.
+        """
+        tokens = parse_template(template)
+        node = self.root
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+            if isinstance(token, Param):
+                node = self._insert_param(node, token)
+                index += 1
+                continue
+            end = index
+            while end < len(tokens) and not isinstance(tokens[end], Param):
+                end += 1
+            node = self._insert_static(node, tuple(tokens[index:end]))  # type: ignore
+            index = end
+        return node
+
+    def _insert_param(self, node: RadixNode, param: Param) -> RadixNode:
+        for edge in node.params:
+            if edge.name == param.name and edge.convertor_name == param.convertor:
+                return edge.node
+        convertor = CONVERTOR_TYPES[param.convertor]
+        pattern = None if param.convertor == "str" else re.compile(convertor.regex)
+        edge = ParamEdge(param.name, param.convertor, convertor, pattern, RadixNode())
+        node.params.append(edge)
+        return edge.node
+
+    def _insert_static(self, node: RadixNode, segments: tuple[str, ...]) -> RadixNode:
+        while segments:
+            child = node.children.get(segments[0])
+            if child is None:
+                child = RadixNode(segments)
+                node.children[segments[0]] = child
+                return child
+            common = 0
+            while (
+                common < len(child.prefix)
+                and common < len(segments)
+                and child.prefix[common] == segments[common]
+            ):
+                common += 1
+            if common < len(child.prefix):
+                middle = RadixNode(child.prefix[:common])
+                child.prefix = child.prefix[common:]
+                middle.children[child.prefix[0]] = child
+                node.children[segments[0]] = middle
+                child = middle
+            node = child
+            segments = segments[common:]
+        return node
+
+    def lookup(
+        self, path: str, prefix: bool = False
+    ) -> Iterator[tuple[Any, dict[str, Any]]]:
+        """Yields the values of the templates matching a path.
+
+        Args:
+            path (str): The request path.
+            prefix (bool, optional): Whether templates matching only the leading segments
+                of the path match too. Defaults to False.
+
+        Yields:
+            Iterator[tuple[Any, dict[str, Any]]]: The value and converted path parameters of each match.
+        """
+        return self._walk(self.root, path.split("/")[1:], 0, {}, prefix)
+
+    def _walk(
+        self,
+        node: RadixNode,
+        segments: list[str],
+        index: int,
+        params: dict[str, Any],
+        prefix: bool = False,
+    ) -> Iterator[tuple[Any, dict[str, Any]]]:
+        if node.value is not None and (prefix or index == len(segments)):
+            yield node.value, params
+        if index == len(segments):
+            return
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            end = index + len(child.prefix)
+            if tuple(segments[index:end]) == child.prefix:
+                yield from self._walk(child, segments, end, params, prefix)
+        if not segment:
+            return
+        for edge in node.params:
+            if edge.pattern is None or edge.pattern.fullmatch(segment):
+                yield from self._walk(
+                    edge.node,
+                    segments,
+                    index + 1,
+                    {**params, edge.name: edge.convertor.convert(segment)},
+                    prefix,
+                )
+
+
+class RouteLeaf:
+    """The routes registered for one route template.
+
+    Attributes:
+        methods (dict[str, Route]): The HTTP route of each method.
+        any (Route | None): The HTTP route accepting every method.
+        websocket (WebSocketRoute | None): The WebSocket route.
+    """
+
+    __slots__ = ("methods", "any", "websocket")
+
+    def __init__(self) -> None:
+        self.methods: dict[str, Route] = {}
+        self.any: Route | None = None
+        self.websocket: WebSocketRoute | None = None
+
+
+class RouteTree(BaseRoute):
+    """A route matching its child routes through a radix tree.
+
+    The tree behaves like the list of its routes inside a Starlette router: the
+    matched child route handles the request, a path matching only with another
+    method is a partial match, and routes whose templates cannot be stored in the
+    tree are matched linearly after it.
+
+    Args:
+        routes (Sequence[BaseRoute]): The routes to match.
+
+    Attributes:
+        routes (list[BaseRoute]): The routes of the tree.
+    """
+
+    def __init__(self, routes: Sequence[BaseRoute] = ()) -> None:
+        self.routes: list[BaseRoute] = []
+        self._tree = RadixTree()
+        self._fallback: list[BaseRoute] = []
+        for route in routes:
+            self.add(route)
+
+    def add(self, route: BaseRoute) -> None:
+        """Adds a route to the tree.
+
+        Args:
+            route (BaseRoute): The route to add.
+        """
+        self.routes.append(route)
+        if not isinstance(route, (Route, WebSocketRoute)):
+            self._fallback.append(route)
+            return
+        try:
+            node = self._tree.insert(route.path)
+        except ValueError:
+            self._fallback.append(route)
+            return
+        leaf: RouteLeaf = node.value or RouteLeaf()
+        node.value = leaf
+        if isinstance(route, WebSocketRoute):
+            leaf.websocket = leaf.websocket or route
+        elif route.methods:
+            for method in route.methods:
+                leaf.methods.setdefault(method, route)
+        else:
+            leaf.any = leaf.any or route
+
+    def replace(self, old: BaseRoute | None, new: BaseRoute | None) -> None:
+        """Replaces, removes or adds a route.
+
+        Removing a route rebuilds the tree from the remaining routes and swaps it
+        in, so concurrent lookups see either the old or the new tree. A replaced
+        route keeps its position; replacing a route with itself reindexes it after
+        its methods changed.
+
+        Args:
+            old (BaseRoute | None): The route to remove, None to only add the new route.
+            new (BaseRoute | None): The route to add, None to only remove the old route.
+        """
+        if old is None:
+            if new is not None:
+                self.add(new)
+            return
+        routes = [new if route is old else route for route in self.routes]
+        if new is not None and not any(route is old for route in self.routes):
+            routes.append(new)
+        rebuilt = RouteTree([route for route in routes if route is not None])
+        self._tree, self._fallback = rebuilt._tree, rebuilt._fallback
+        self.routes = rebuilt.routes
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        scope_type = scope["type"]
+        if scope_type not in ("http", "websocket"):
+            return Match.NONE, {}
+        partial: Scope | None = None
+        for leaf, params in self._tree.lookup(get_route_path(scope)):
+            if scope_type == "http":
+                route = leaf.methods.get(scope["method"]) or leaf.any
+                if route is None:
+                    if partial is None and leaf.methods:
+                        route = next(iter(leaf.methods.values()))
+                        partial = self._child_scope(scope, route, params)
+                    continue
+            else:
+                route = leaf.websocket
+                if route is None:
+                    continue
+            return Match.FULL, self._child_scope(scope, route, params)
+        for route in self._fallback:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return match, {**child_scope, "pypox.route": route}
+            if match == Match.PARTIAL and partial is None:
+                partial = {**child_scope, "pypox.route": route}
+        if partial is not None:
+            return Match.PARTIAL, partial
+        return Match.NONE, {}
+
+    def _child_scope(
+        self, scope: Scope, route: BaseRoute, params: dict[str, Any]
+    ) -> Scope:
+        path_params = dict(scope.get("path_params", {}))
+        path_params.update(params)
+        endpoint = getattr(route, "endpoint", None)
+        endpoints = getattr(route, "endpoints", None)
+        if endpoints and scope["type"] == "http":
+            endpoint = endpoints.get(scope["method"], endpoint)
+        return {
+            "endpoint": endpoint,
+            "path_params": path_params,
+            "pypox.route": route,
+        }
+
+    def url_path_for(self, name: str, /, **path_params: Any) -> URLPath:
+        for route in self.routes:
+            try:
+                return route.url_path_for(name, **path_params)
+            except NoMatchFound:
+                pass
+        raise NoMatchFound(name, path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await scope["pypox.route"].handle(scope, receive, send)
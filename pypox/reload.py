@@ -0,0 +1,119 @@
+"""
+This module contains the file watcher used by the incremental route reload.
+
+The watcher uses ``watchfiles`` (inotify on Linux) when it is installed and falls back
+to polling the modification times of the route files otherwise. Changes are reported
+as the set of route file paths that were added, modified or deleted.
+
+Classes:
+    - RouteWatcher: A background thread watching the route files of a directory.
+"""
+
+from typing import Callable, Iterable
+import os
+import threading
+
+try:
+    import watchfiles
+except ImportError:  # pragma: no cover - depends on the environment
+    watchfiles = None
+
+
+class RouteWatcher:
+    """A background thread watching the route files of a directory.
+
+    Args:
+        directory (str): The directory to watch.
+        files (Iterable[str]): The route file names to report.
+        callback (Callable[[set[str]], None]): Called from the watcher thread with the changed paths.
+        interval (float, optional): The polling interval in seconds. Defaults to 1.0.
+        force_polling (bool, optional): Whether to poll even when watchfiles is installed. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        files: Iterable[str],
+        callback: Callable[[set[str]], None],
+        interval: float = 1.0,
+        force_polling: bool = False,
+    ) -> None:
+        # watchfiles reports absolute paths, so polling reports them too.
+        self._directory = os.path.abspath(directory)
+        self._files = frozenset(files)
+        self._callback = callback
+        self._interval = interval
+        self._force_polling = force_polling
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """Returns whether the watcher thread is running.
+
+        Returns:
+            bool: True if the watcher is running.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Starts the watcher thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        snapshot = self.scan()
+        self._thread = threading.Thread(
+            target=self._run, args=(snapshot,), name="pypox-route-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the watcher thread and waits for it to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def scan(self) -> dict[str, int]:
+        """Returns the modification time of every route file.
+
+        Returns:
+            dict[str, int]: The modification time in nanoseconds of each route file path.
+        """
+        snapshot: dict[str, int] = {}
+        for root, _, files in os.walk(self._directory):
+            for file in files:
+                if file in self._files:
+                    path = os.path.join(root, file)
+                    try:
+                        snapshot[path] = os.stat(path).st_mtime_ns
+                    except OSError:
+                        pass
+        return snapshot
+
+    def _run(self, snapshot: dict[str, int]) -> None:
+        if watchfiles is not None and not self._force_polling:
+            self._watch()
+        else:
+            self._poll(snapshot)
+
+    def _watch(self) -> None:
+        for changes in watchfiles.watch(
+            self._directory,
+            watch_filter=lambda _, path: os.path.basename(path) in self._files,
+            stop_event=self._stop,
+            raise_interrupt=False,
+        ):
+            self._callback({path for _, path in changes})
+
+    def _poll(self, snapshot: dict[str, int]) -> None:
+        while not self._stop.wait(self._interval):
+            current = self.scan()
+            changed = {
+                path
+                for path in snapshot.keys() | current.keys()
+                if snapshot.get(path) != current.get(path)
+            }
+            snapshot = current
+            if changed:
+                self._callback(changed)
@@ -0,0 +1,62 @@
+"""
+This module contains the response classes provided by pypox.
+
+Classes:
+    - PypoxJSONResponse: A JSON response rendered with orjson.
+"""
+
+from typing import Any, Callable, Mapping
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse
+import inspect
+import orjson
+
+
+class PypoxJSONResponse(JSONResponse):
+    """A JSON response rendered with orjson.
+
+    orjson serializes dataclasses, datetimes, UUIDs and enums natively. numpy
+    arrays are serialized through the ``OPT_SERIALIZE_NUMPY`` option, enabled
+    by default.
+
+    Subclasses may customize ``option`` and ``default`` at class level; a plain
+    function assigned to ``default`` is used as is, not bound as a method.
+
+    Args:
+        content (Any): The content to be rendered.
+        status_code (int, optional): The status code of the response. Defaults to 200.
+        headers (Mapping[str, str] | None, optional): The headers of the response. Defaults to None.
+        media_type (str | None, optional): The media type of the response. Defaults to None.
+        background (BackgroundTask | None, optional): A task to run after the response is sent. Defaults to None.
+        option (int | None, optional): The orjson option flags. Defaults to the class ``option``.
+        default (Callable[[Any], Any] | None, optional): The orjson fallback for unsupported types. Defaults to the class ``default``.
+
+    Attributes:
+        option (int): The orjson option flags, e.g. ``orjson.OPT_PASSTHROUGH_DATETIME`` or ``orjson.OPT_UTC_Z``.
+        default (Callable[[Any], Any] | None): The orjson fallback for unsupported types.
+    """
+
+    option: int = orjson.OPT_SERIALIZE_NUMPY
+    default: Callable[[Any], Any] | None = None
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+        option: int | None = None,
+        default: Callable[[Any], Any] | None = None,
+    ) -> None:
+        if option is not None:
+            self.option = option
+        if default is None:
+            default = inspect.getattr_static(type(self), "default")
+            if isinstance(default, staticmethod):
+                default = default.__func__
+        self.default = default
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=self.default, option=self.option)
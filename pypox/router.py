@@ -1,14 +1,335 @@
-from contextlib import AbstractAsyncContextManager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from importlib.machinery import ModuleSpec
-from typing import Any, Callable, Generator, Sequence
+from typing import Any, Callable, Generator, Iterable, NamedTuple, Sequence
 from starlette.middleware import Middleware
-from starlette.routing import BaseRoute, Router, Route, WebSocketRoute
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.responses import PlainTextResponse
+from starlette.routing import (
+    BaseRoute,
+    Match,
+    Router,
+    Route,
+    WebSocketRoute,
+    compile_path,
+    get_name,
+    request_response,
+    websocket_session,
+)
 from starlette.endpoints import HTTPEndpoint, WebSocketEndpoint
-from starlette.types import ASGIApp
+from starlette._utils import get_route_path, is_async_callable
+from starlette.types import ASGIApp, Receive, Scope, Send
 from typing import MutableMapping, Awaitable, Mapping
 from types import ModuleType
+from pypox.instrumentation import end_routing_span, instrumentation
+from pypox.manifest import ManifestEntry, RouteManifest
+from pypox.radix import RouteTree
+from pypox.reload import RouteWatcher
+import asyncio
 import importlib.util
+import inspect
 import os
+import threading
+import time
+
+
+class ModuleTiming(NamedTuple):
+    """The time spent loading a route module at startup.
+
+    Attributes:
+        module_path (str): The path to the module file.
+        seconds (float): The wall time spent reading, compiling and executing the module.
+    """
+
+    module_path: str
+    seconds: float
+
+
+class LazyEndpoint:
+    """
+    An ASGI app that imports its endpoint module on the first call.
+
+    The module is imported in the thread pool under a lock, so concurrent first
+    calls import it once without blocking the event loop.
+
+    Args:
+        router (BaseRouter): The router that loads the module.
+        module_name (str): The name of the module.
+        module_path (str): The path to the module file.
+        attribute (str): The name of the endpoint in the module.
+    """
+
+    def __init__(
+        self, router: "BaseRouter", module_name: str, module_path: str, attribute: str
+    ) -> None:
+        self.__name__ = attribute
+        self._router = router
+        self._module_name = module_name
+        self._module_path = module_path
+        self._attribute = attribute
+        self._app: ASGIApp | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def module_path(self) -> str:
+        """Returns the path to the module file.
+
+        Returns:
+            str: The path to the module file.
+        """
+        return self._module_path
+
+    @property
+    def loaded(self) -> bool:
+        """Returns whether the module has been imported.
+
+        Returns:
+            bool: True if the endpoint is loaded.
+        """
+        return self._app is not None
+
+    def resolve(self) -> Any:
+        """Imports the module and returns its endpoint as defined in the module.
+
+        Returns:
+            Any: The endpoint function or class.
+        """
+        module = self._router.load_module(self._module_name, self._module_path)
+        return getattr(module, self._attribute)
+
+    def load(self) -> ASGIApp:
+        """Imports the module and wraps its endpoint into an ASGI app.
+
+        Returns:
+            ASGIApp: The endpoint as an ASGI app.
+        """
+        obj = self.resolve()
+        if inspect.isfunction(obj) or inspect.ismethod(obj):
+            if self._router.router_type == "websocket":
+                return websocket_session(obj)
+            return request_response(obj)
+        return obj
+
+    async def ensure_loaded(self) -> ASGIApp:
+        """Loads the endpoint once and returns it.
+
+        Returns:
+            ASGIApp: The endpoint as an ASGI app.
+        """
+        if self._app is None:
+            async with self._lock:
+                if self._app is None:
+                    self._app = await run_in_threadpool(self.load)
+        return self._app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        app = self._app
+        if app is None:
+            app = await self.ensure_loaded()
+        await app(scope, receive, send)
+
+
+def replace_route(
+    routes: list[BaseRoute], old: BaseRoute | None, new: BaseRoute | None
+) -> None:
+    """Replaces, removes or appends a route in a route list in place.
+
+    Args:
+        routes (list[BaseRoute]): The route list.
+        old (BaseRoute | None): The route to replace, None to append the new route.
+        new (BaseRoute | None): The new route, None to remove the old route.
+    """
+    index = next((i for i, route in enumerate(routes) if route is old), None)
+    if index is None:
+        if new is not None:
+            routes.append(new)
+    elif new is None:
+        del routes[index]
+    else:
+        routes[index] = new
+
+
+def wrap_lifespan(
+    lifespan: Callable[[Any], Any],
+    startup_hooks: Sequence[Callable[[], Any]],
+    shutdown_hooks: Sequence[Callable[[], Any]],
+) -> Callable[[Any], AbstractAsyncContextManager[Any]]:
+    """Wraps a lifespan so the given hooks run around it.
+
+    Starlette ignores ``on_startup`` and ``on_shutdown`` once a lifespan is given,
+    so routers needing startup work, like the reload watcher, wrap it instead.
+
+    Args:
+        lifespan (Callable[[Any], Any]): The lifespan context or async generator function.
+        startup_hooks (Sequence[Callable[[], Any]]): Called before the lifespan starts.
+        shutdown_hooks (Sequence[Callable[[], Any]]): Called after the lifespan ends.
+
+    Returns:
+        Callable[[Any], AbstractAsyncContextManager[Any]]: The wrapped lifespan.
+    """
+    if inspect.isasyncgenfunction(lifespan):
+        lifespan = asynccontextmanager(lifespan)
+
+    async def run(hooks: Sequence[Callable[[], Any]]) -> None:
+        for hook in hooks:
+            if is_async_callable(hook):
+                await hook()
+            else:
+                hook()
+
+    @asynccontextmanager
+    async def wrapped(app: Any):
+        await run(startup_hooks)
+        try:
+            async with lifespan(app) as state:
+                yield state
+        finally:
+            await run(shutdown_hooks)
+
+    return wrapped
+
+
+class MethodRoute(Route):
+    """
+    A route serving every method file of one directory.
+
+    The endpoints are kept in a method table, so a request evaluates the path
+    regex once and selects its endpoint with a single lookup. A class endpoint,
+    such as an HTTPEndpoint from ``router.py``, receives the methods that have no
+    method file. The ``Allow`` header of 405 responses is precomputed.
+
+    Args:
+        path (str): The path of the route.
+        include_in_schema (bool, optional): Whether to include the route in the API schema. Defaults to True.
+
+    Attributes:
+        endpoints (dict[str, Any]): The endpoint of each method.
+        fallback (Any): The class endpoint receiving the other methods, if any.
+    """
+
+    def __init__(self, path: str, include_in_schema: bool = True) -> None:
+        assert path.startswith("/"), "Routed paths must start with '/'"
+        self.path = path
+        self.endpoint: Any = None
+        self.name = path
+        self.include_in_schema = include_in_schema
+        self.endpoints: dict[str, Any] = {}
+        self.fallback: Any = None
+        self.methods: set[str] | None = set()
+        self._apps: dict[str, ASGIApp] = {}
+        self._fallback_app: ASGIApp | None = None
+        self._allow = ""
+        self.path_regex, self.path_format, self.param_convertors = compile_path(path)
+
+    def add(self, method: str, endpoint: Any) -> None:
+        """Sets the endpoint of a method.
+
+        Functions are wrapped as request/response endpoints, other callables are
+        used as ASGI apps. A GET endpoint also serves HEAD unless HEAD is set.
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (Any): The endpoint of the method.
+        """
+        endpoints = dict(self.endpoints)
+        endpoints[method.upper()] = endpoint
+        self._set(endpoints, self.fallback)
+
+    def remove(self, method: str) -> None:
+        """Removes the endpoint of a method.
+
+        Args:
+            method (str): The HTTP method.
+        """
+        endpoints = dict(self.endpoints)
+        endpoints.pop(method.upper(), None)
+        self._set(endpoints, self.fallback)
+
+    def set_fallback(self, endpoint: Any) -> None:
+        """Sets the class endpoint receiving the methods without a method file.
+
+        Args:
+            endpoint (Any): The ASGI endpoint, or None to remove it.
+        """
+        self._set(self.endpoints, endpoint)
+
+    def _set(self, endpoints: dict[str, Any], fallback: Any) -> None:
+        apps: dict[str, ASGIApp] = {}
+        for method, endpoint in endpoints.items():
+            if inspect.isfunction(endpoint) or inspect.ismethod(endpoint):
+                apps[method] = request_response(endpoint)
+            else:
+                apps[method] = endpoint
+        if "GET" in apps and "HEAD" not in apps:
+            apps["HEAD"] = apps["GET"]
+        self.endpoints = endpoints
+        self.fallback = fallback
+        self.endpoint = next(iter(endpoints.values()), fallback)
+        if self.endpoint is not None:
+            self.name = get_name(self.endpoint)
+        self.methods = None if fallback is not None else set(apps)
+        self._allow = ", ".join(sorted(apps))
+        if inspect.isfunction(fallback) or inspect.ismethod(fallback):
+            self._fallback_app = request_response(fallback)
+        else:
+            self._fallback_app = fallback
+        self._apps = apps
+
+    @property
+    def allow(self) -> str:
+        """Returns the precomputed ``Allow`` header.
+
+        Returns:
+            str: The methods served by the method table.
+        """
+        return self._allow
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if scope["type"] != "http":
+            return Match.NONE, {}
+        match = self.path_regex.match(get_route_path(scope))
+        if not match:
+            return Match.NONE, {}
+        matched_params = match.groupdict()
+        for key, value in matched_params.items():
+            matched_params[key] = self.param_convertors[key].convert(value)
+        path_params = dict(scope.get("path_params", {}))
+        path_params.update(matched_params)
+        method = scope["method"]
+        endpoint = self.endpoints.get(method, self.fallback)
+        if method == "HEAD" and endpoint is None:
+            endpoint = self.endpoints.get("GET")
+        child_scope = {"endpoint": endpoint, "path_params": path_params}
+        if method in self._apps or self._fallback_app is not None:
+            return Match.FULL, child_scope
+        return Match.PARTIAL, child_scope
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if instrumentation.enabled:
+            end_routing_span(scope)
+        app = self._apps.get(scope["method"], self._fallback_app)
+        if app is not None:
+            await app(scope, receive, send)
+            return
+        headers = {"Allow": self._allow}
+        if "app" in scope:
+            raise HTTPException(status_code=405, headers=headers)
+        response = PlainTextResponse(
+            "Method Not Allowed", status_code=405, headers=headers
+        )
+        await response(scope, receive, send)
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, MethodRoute)
+            and self.path == other.path
+            and self.endpoints == other.endpoints
+            and self.fallback == other.fallback
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(path={self.path!r}, methods={sorted(self._apps)!r})"
 
 
 class BaseRouter(Router):
@@ -30,6 +351,13 @@ class BaseRouter(Router):
         on_shutdown (Sequence[Callable[[], Any]] | None): A sequence of functions to be called on shutdown.
         lifespan (Callable[[Any], AbstractAsyncContextManager[None]] | Callable[[Any], AbstractAsyncContextManager[Mapping[str, Any]]] | None): A callable that manages the lifespan of the router.
         middleware (Sequence[Middleware] | None): A sequence of middleware functions to be applied to the routes.
+        manifest (str | None): The path of the route manifest reused across restarts.
+        lazy (bool): Whether endpoint modules are imported on their first request instead of at startup.
+        warm_up (bool): Whether lazy endpoint modules are imported in a background task after startup.
+        load_workers (int): The number of threads loading modules concurrently at startup.
+        radix (bool): Whether the routes are matched through a radix tree instead of one by one.
+        reload (bool): Whether changed route files are reloaded while the application runs.
+        reload_interval (float): The polling interval of the reload watcher when inotify is not available.
     """
 
     def __init__(
@@ -60,13 +388,58 @@ class BaseRouter(Router):
         ) = None,
         *,
         middleware: Sequence[Middleware] | None = None,
+        manifest: str | None = None,
+        lazy: bool = False,
+        warm_up: bool = False,
+        load_workers: int = 0,
+        radix: bool = False,
+        reload: bool = False,
+        reload_interval: float = 1.0,
     ) -> None:
 
         self._router_type = _type
         self._callable = entry_point
         self._class_callable = class_callable
-        self._directory = directory
+        # Absolute, so paths reported by the reload watcher map back to routes.
+        self._directory = os.path.abspath(directory) if directory else directory
         self._file = file
+        self._manifest = RouteManifest(manifest) if manifest else None
+        self._modules: dict[str, ModuleType] = {}
+        self._lazy = lazy
+        self._load_workers = load_workers
+        self._radix = radix
+        self._load_report: list[ModuleTiming] = []
+        self._lazy_endpoints: list[LazyEndpoint] = []
+        self._warm_up_task: asyncio.Task | None = None
+        self._warms_up = lazy and warm_up
+        self._method_routes: dict[str, MethodRoute] = {}
+        self._websocket_routes: dict[str, BaseRoute] = {}
+        self._tree: RouteTree | None = None
+        self._route_listeners: list[
+            Callable[[BaseRoute | None, BaseRoute | None], None]
+        ] = []
+        self._reload_listeners: list[Callable[[], None]] = []
+        self._reload_lock = threading.Lock()
+        self._reload_errors: dict[str, Exception] = {}
+        self._watcher: RouteWatcher | None = None
+        if reload:
+            self._watcher = RouteWatcher(
+                self._directory, file, self.reload_modules, reload_interval
+            )
+        self._startup_hooks: list[Callable[[], Any]] = []
+        self._shutdown_hooks: list[Callable[[], Any]] = []
+        if self._warms_up:
+            self._startup_hooks.append(self.start_warm_up)
+        if self._watcher:
+            self._startup_hooks.append(self._watcher.start)
+            self._shutdown_hooks.append(self._watcher.stop)
+        if lifespan is None:
+            on_startup = [*(on_startup or []), *self._startup_hooks]
+            on_shutdown = [*(on_shutdown or []), *self._shutdown_hooks]
+        elif self._startup_hooks or self._shutdown_hooks:
+            lifespan = wrap_lifespan(
+                lifespan, self._startup_hooks, self._shutdown_hooks
+            )
         super().__init__(
             self.generate_routes(),
             redirect_slashes,
@@ -99,39 +472,311 @@ class BaseRouter(Router):
         """
         return self._router_type
 
-    def generate_routes(self) -> list[Route | WebSocketRoute]:
+    @property
+    def load_report(self) -> list[ModuleTiming]:
+        """Returns the time spent loading each module at startup.
+
+        Returns:
+            list[ModuleTiming]: One timing per module, in registration order.
+        """
+        return self._load_report
+
+    @property
+    def startup_hooks(self) -> list[Callable[[], Any]]:
+        """Returns the functions the router needs to run on application startup.
+
+        Returns:
+            list[Callable[[], Any]]: The startup hooks of the warm-up and reload features.
+        """
+        return self._startup_hooks
+
+    @property
+    def shutdown_hooks(self) -> list[Callable[[], Any]]:
+        """Returns the functions the router needs to run on application shutdown.
+
+        Returns:
+            list[Callable[[], Any]]: The shutdown hooks of the reload feature.
+        """
+        return self._shutdown_hooks
+
+    @property
+    def reload_errors(self) -> dict[str, Exception]:
+        """Returns the errors raised by route files that failed to reload.
+
+        Returns:
+            dict[str, Exception]: The last error of each module path that failed to reload.
+        """
+        return self._reload_errors
+
+    @property
+    def warms_up(self) -> bool:
+        """Returns whether lazy endpoints are imported in the background after startup.
+
+        Returns:
+            bool: True if the router warms up its lazy endpoints.
+        """
+        return self._warms_up
+
+    @property
+    def lazy_endpoints(self) -> list[LazyEndpoint]:
+        """Returns the lazily loaded endpoints of the router.
+
+        Returns:
+            list[LazyEndpoint]: The lazy endpoints, empty unless the router is lazy.
+        """
+        return self._lazy_endpoints
+
+    @property
+    def manifest_key(self) -> str:
+        """Returns the key of the router in the route manifest.
+
+        Returns:
+            str: The router type, directory and file names of the router.
+        """
+        return ":".join(
+            [self.router_type, os.path.abspath(self.directory), *sorted(self._file)]
+        )
+
+    def generate_routes(self) -> list[BaseRoute]:
         """Generates routes based on the files in the directory.
 
+        In radix mode the generated routes are returned inside a single RouteTree.
+
         Returns:
-            list[Route | WebSocketRoute]: A list of routes generated from the files.
+            list[BaseRoute]: A list of routes generated from the files.
         """
-        router: list[Route | WebSocketRoute] = []
+        router: list[BaseRoute] = []
+        entries = self.discover()
+        if not self._lazy:
+            self.load_modules(entries)
 
-        for root, file in self.walk():
-            module_name: str = file.split(".")[0]
-            module_path: str = os.path.join(root, file)
+        method_routes = self._method_routes
+        for entry in entries:
+            module_name: str = os.path.basename(entry.module_path).split(".")[0]
+            if entry.method in ["router", "websocket"]:
+                attribute = self._class_callable
+            else:
+                attribute = self.callable
 
-            module: ModuleType = self.load_module(module_name, module_path)
+            if self._lazy:
+                obj: Any = LazyEndpoint(self, module_name, entry.module_path, attribute)
+                self._lazy_endpoints.append(obj)
+            else:
+                module: ModuleType = self.load_module(module_name, entry.module_path)
+                obj = getattr(module, attribute)
 
-            route_path: str = self.create_route_path(self.directory, root)
+            if self.router_type != "http":
+                route = self.create_route(entry.route_path, obj)
+                self._websocket_routes[entry.route_path] = route
+                router.append(route)
+                continue
 
-            if self._file[file] in ["router", "websocket"]:
-                router.append(
-                    self.create_route(
-                        route_path,
-                        getattr(module, self._class_callable),
-                    )
+            route = method_routes.get(entry.route_path)
+            if route is None:
+                route = method_routes[entry.route_path] = MethodRoute(entry.route_path)
+                router.append(route)
+            if entry.method == "router":
+                route.set_fallback(obj)
+            else:
+                route.add(entry.method, obj)
+
+        if self._radix:
+            self._tree = RouteTree(router)
+            return [self._tree]
+        return router
+
+    def add_route_listener(
+        self, listener: Callable[[BaseRoute | None, BaseRoute | None], None]
+    ) -> None:
+        """Registers a function called when a reload replaces, adds or removes a route.
+
+        The listener receives the old and the new route; the old route is None for
+        added routes and the new route is None for removed routes. Applications
+        holding a copy of the routes use it to stay in sync.
+
+        Args:
+            listener (Callable[[BaseRoute | None, BaseRoute | None], None]): The listener.
+        """
+        self._route_listeners.append(listener)
+
+    def add_reload_listener(self, listener: Callable[[], None]) -> None:
+        """Registers a function called after a reload changed at least one endpoint.
+
+        Unlike route listeners, it is also called when an endpoint is swapped in
+        place and when the routes are matched through the radix tree.
+
+        Args:
+            listener (Callable[[], None]): The listener.
+        """
+        self._reload_listeners.append(listener)
+
+    def reload_modules(self, module_paths: Iterable[str]) -> None:
+        """Reloads the given route files and swaps the affected route entries.
+
+        Only the changed modules are imported again. Method endpoints are swapped in
+        the method table of their route, which is replaced atomically, so requests
+        already being handled finish with the endpoint they started with. Deleted
+        files remove their endpoint, and files in new directories add a route. A
+        file that fails to import keeps its previous endpoint and its error is kept
+        in ``reload_errors``.
+
+        Args:
+            module_paths (Iterable[str]): The paths of the added, modified or deleted route files.
+        """
+        with self._reload_lock:
+            reloaded = False
+            for module_path in sorted(map(os.path.abspath, module_paths)):
+                file = os.path.basename(module_path)
+                relative = os.path.relpath(os.path.dirname(module_path), self.directory)
+                if file not in self._file or relative.startswith(os.pardir):
+                    continue
+                kind = self._file[file]
+                if kind in ["router", "websocket"]:
+                    attribute = self._class_callable
+                else:
+                    attribute = self.callable
+                obj = None
+                if os.path.exists(module_path):
+                    cached = self._modules.pop(module_path, None)
+                    try:
+                        # the bytecode cache only tracks whole-second mtimes
+                        os.remove(importlib.util.cache_from_source(module_path))
+                    except OSError:
+                        pass
+                    try:
+                        module = self.load_module(file.split(".")[0], module_path)
+                        obj = getattr(module, attribute)
+                    except Exception as exc:
+                        if cached is not None:
+                            self._modules[module_path] = cached
+                        self._reload_errors[module_path] = exc
+                        continue
+                self._reload_errors.pop(module_path, None)
+                route_path = self.create_route_path(
+                    self.directory,
+                    os.path.normpath(os.path.join(self.directory, relative)),
                 )
+                if self.router_type == "http":
+                    self._reload_method(route_path, kind, obj)
+                else:
+                    self._reload_websocket(route_path, obj)
+                reloaded = True
+            if reloaded:
+                for listener in self._reload_listeners:
+                    listener()
+
+    def _reload_method(self, route_path: str, kind: str, obj: Any) -> None:
+        route = self._method_routes.get(route_path)
+        if route is None:
+            if obj is None:
+                return
+            route = MethodRoute(route_path)
+        elif obj is None:
+            if kind == "router":
+                route.set_fallback(None)
             else:
-                router.append(
-                    self.create_route(
-                        route_path,
-                        getattr(module, self.callable),
-                        methods=[self._file[file]],
+                route.remove(kind)
+            if not route.endpoints and route.fallback is None:
+                del self._method_routes[route_path]
+                self._replace_route(route, None)
+            elif self._tree is not None:
+                # the tree indexed the route by the methods it had when added
+                self._tree.replace(route, route)
+            return
+        if kind == "router":
+            route.set_fallback(obj)
+        else:
+            route.add(kind, obj)
+        if route_path not in self._method_routes:
+            self._method_routes[route_path] = route
+            self._replace_route(None, route)
+        elif self._tree is not None:
+            self._tree.replace(route, route)
+
+    def _reload_websocket(self, route_path: str, obj: Any) -> None:
+        old = self._websocket_routes.pop(route_path, None)
+        new = None
+        if obj is not None:
+            new = self._websocket_routes[route_path] = self.create_route(
+                route_path, obj
+            )
+        self._replace_route(old, new)
+
+    def _replace_route(self, old: BaseRoute | None, new: BaseRoute | None) -> None:
+        if self._tree is not None:
+            self._tree.replace(old, new)
+            return
+        replace_route(self.routes, old, new)
+        for listener in self._route_listeners:
+            listener(old, new)
+
+    def load_modules(self, entries: list[ManifestEntry]) -> None:
+        """Loads the modules of the given entries and records their load times.
+
+        With more than one load worker the modules are read, compiled and executed
+        in a thread pool. Results are collected in entry order, so routes are
+        registered in the same order as with sequential loading.
+
+        Args:
+            entries (list[ManifestEntry]): The discovered route files.
+        """
+        module_paths = list(dict.fromkeys(entry.module_path for entry in entries))
+        if self._load_workers > 1 and len(module_paths) > 1:
+            with ThreadPoolExecutor(max_workers=self._load_workers) as executor:
+                self._load_report = list(executor.map(self._timed_load, module_paths))
+        else:
+            self._load_report = [self._timed_load(path) for path in module_paths]
+
+    def _timed_load(self, module_path: str) -> ModuleTiming:
+        start = time.perf_counter()
+        self.load_module(os.path.basename(module_path).split(".")[0], module_path)
+        return ModuleTiming(module_path, time.perf_counter() - start)
+
+    async def warm_up(self) -> None:
+        """Imports the modules of every lazy endpoint that is not loaded yet."""
+        for endpoint in self._lazy_endpoints:
+            await endpoint.ensure_loaded()
+
+    def start_warm_up(self) -> None:
+        """Starts importing the lazy endpoints in a background task."""
+        if self._warm_up_task is None:
+            self._warm_up_task = asyncio.get_running_loop().create_task(self.warm_up())
+
+    def discover(self) -> list[ManifestEntry]:
+        """Discovers the route files of the directory.
+
+        When a route manifest is configured and none of the recorded directories or
+        files changed, the recorded entries are returned without walking the
+        directory. Otherwise the directory is walked and the manifest is updated.
+
+        Returns:
+            list[ManifestEntry]: The route files of the directory.
+        """
+        if self._manifest:
+            entries = self._manifest.load(self.manifest_key)
+            if entries is not None:
+                return entries
+
+        directories: dict[str, int] = {}
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            directories[root] = os.stat(root).st_mtime_ns
+            for file in files:
+                if file not in self._file:
+                    continue
+                module_path: str = os.path.join(root, file)
+                entries.append(
+                    ManifestEntry(
+                        self.create_route_path(self.directory, root),
+                        self._file[file],
+                        module_path,
+                        os.stat(module_path).st_mtime_ns,
                     )
                 )
 
-        return router
+        if self._manifest:
+            self._manifest.save(self.manifest_key, directories, entries)
+        return entries
 
     def walk(self) -> Generator[tuple[str, str], Any, None]:
         """Recursively walks through the directory and yields tuples of root and file names.
@@ -148,6 +793,9 @@ class BaseRouter(Router):
         """
         Load a module from a file location.
 
+        Each module file is executed once per router; later calls return the
+        module loaded first.
+
         Args:
             module_name (str): The name of the module.
             module_path (str): The path to the module file.
@@ -159,6 +807,8 @@ class BaseRouter(Router):
         Returns:
             ModuleType: The loaded module.
         """
+        if module_path in self._modules:
+            return self._modules[module_path]
         spec: ModuleSpec | None = importlib.util.spec_from_file_location(
             module_name, module_path
         )
@@ -172,6 +822,7 @@ class BaseRouter(Router):
             module, self._class_callable
         ):
             raise AttributeError(f"Callable {module_name} not found in module")
+        self._modules[module_path] = module
         return module
 
     def create_route_path(self, directory: str, root: str) -> str:
@@ -242,6 +893,13 @@ class HTTPRouter(BaseRouter):
         on_shutdown (Sequence[Callable]): A sequence of functions to run on shutdown.
         lifespan (Callable): A function that returns an async context manager for the router's lifespan.
         middleware (Sequence[Middleware]): A sequence of middleware functions to apply to requests.
+        manifest (str | None): The path of the route manifest reused across restarts.
+        lazy (bool): Whether endpoint modules are imported on their first request instead of at startup.
+        warm_up (bool): Whether lazy endpoint modules are imported in a background task after startup.
+        load_workers (int): The number of threads loading modules concurrently at startup.
+        radix (bool): Whether the routes are matched through a radix tree instead of one by one.
+        reload (bool): Whether changed route files are reloaded while the application runs.
+        reload_interval (float): The polling interval of the reload watcher when inotify is not available.
 
     """
 
@@ -273,6 +931,13 @@ class HTTPRouter(BaseRouter):
         ) = None,
         *,
         middleware: Sequence[Middleware] | None = None,
+        manifest: str | None = None,
+        lazy: bool = False,
+        warm_up: bool = False,
+        load_workers: int = 0,
+        radix: bool = False,
+        reload: bool = False,
+        reload_interval: float = 1.0,
     ) -> None:
 
         if not file:
@@ -299,6 +964,13 @@ class HTTPRouter(BaseRouter):
             on_shutdown,
             lifespan,
             middleware=middleware,
+            manifest=manifest,
+            lazy=lazy,
+            warm_up=warm_up,
+            load_workers=load_workers,
+            radix=radix,
+            reload=reload,
+            reload_interval=reload_interval,
         )
 
 
@@ -323,6 +995,13 @@ class WebsocketRouter(BaseRouter):
         on_shutdown (Sequence[Callable[[], Any]] | None): A sequence of functions to run on application shutdown.
         lifespan (Callable[[Any], AbstractAsyncContextManager[None]] | Callable[[Any], AbstractAsyncContextManager[Mapping[str, Any]]] | None): A function that returns an async context manager for managing the lifespan of the application.
         middleware (Sequence[Middleware] | None): A sequence of middleware functions to apply to requests.
+        manifest (str | None): The path of the route manifest reused across restarts.
+        lazy (bool): Whether endpoint modules are imported on their first request instead of at startup.
+        warm_up (bool): Whether lazy endpoint modules are imported in a background task after startup.
+        load_workers (int): The number of threads loading modules concurrently at startup.
+        radix (bool): Whether the routes are matched through a radix tree instead of one by one.
+        reload (bool): Whether changed route files are reloaded while the application runs.
+        reload_interval (float): The polling interval of the reload watcher when inotify is not available.
 
     """
 
@@ -354,6 +1033,13 @@ class WebsocketRouter(BaseRouter):
         ) = None,
         *,
         middleware: Sequence[Middleware] | None = None,
+        manifest: str | None = None,
+        lazy: bool = False,
+        warm_up: bool = False,
+        load_workers: int = 0,
+        radix: bool = False,
+        reload: bool = False,
+        reload_interval: float = 1.0,
     ) -> None:
 
         if not file:
@@ -370,4 +1056,11 @@ class WebsocketRouter(BaseRouter):
             on_shutdown,
             lifespan,
             middleware=middleware,
+            manifest=manifest,
+            lazy=lazy,
+            warm_up=warm_up,
+            load_workers=load_workers,
+            radix=radix,
+            reload=reload,
+            reload_interval=reload_interval,
         )
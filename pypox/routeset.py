@@ -0,0 +1,93 @@
+"""
+This module contains the compiled route set used by middleware route filters.
+
+Middleware such as the authentication middleware only applies to some routes. The
+route set compiles those route templates once into radix trees, so checking a request
+walks the path segments once instead of comparing the path with every route.
+
+Classes:
+    - RouteSet: A compiled set of route templates.
+"""
+
+from typing import Iterable, Iterator
+from starlette._utils import get_route_path
+from starlette.types import Scope
+from pypox.radix import PARAM_REGEX, RadixTree
+
+
+def _normalize(path: str) -> str:
+    return path.rstrip("/")
+
+
+class RouteSet:
+    """A compiled set of route templates.
+
+    Templates use the syntax of the generated route paths, e.g. ``/users/{id}`` or
+    ``/files/{id:int}``, and match ignoring a trailing slash. A template ending with
+    ``*`` or a ``{name:path}`` parameter matches every path below its prefix, by whole
+    segments: ``/admin/*`` matches ``/admin`` and ``/admin/users`` but not
+    ``/administrator``.
+
+    Args:
+        routes (Iterable[str], optional): The route templates. Defaults to ().
+
+    Raises:
+        ValueError: If a template mixes text and parameters in one segment.
+    """
+
+    def __init__(self, routes: Iterable[str] = ()) -> None:
+        self._templates: list[str] = []
+        self._exact = RadixTree()
+        self._prefixes = RadixTree()
+        for route in routes:
+            self.add(route)
+
+    def add(self, template: str) -> None:
+        """Adds a route template to the set.
+
+        Args:
+            template (str): The route template.
+        """
+        path, _, last = template.rpartition("/")
+        match = PARAM_REGEX.match(last)
+        if last == "*" or (match and match.group(2) == "path"):
+            self._prefixes.insert(_normalize(path)).value = template
+        else:
+            self._exact.insert(_normalize(template)).value = template
+        self._templates.append(template)
+
+    def match(self, path: str) -> str | None:
+        """Returns the template matching a path.
+
+        Args:
+            path (str): The request path.
+
+        Returns:
+            str | None: The matching template, exact templates first, or None if no template matches.
+        """
+        path = _normalize(path)
+        for template, _ in self._exact.lookup(path):
+            return template
+        for template, _ in self._prefixes.lookup(path, prefix=True):
+            return template
+        return None
+
+    def matches(self, scope: Scope) -> bool:
+        """Returns whether the path of a request matches the set.
+
+        Args:
+            scope (Scope): The request scope.
+
+        Returns:
+            bool: True if a template matches the request path.
+        """
+        return self.match(get_route_path(scope)) is not None
+
+    def __contains__(self, path: str) -> bool:
+        return self.match(path) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._templates)
+
+    def __len__(self) -> int:
+        return len(self._templates)
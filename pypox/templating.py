@@ -0,0 +1,294 @@
+"""
+This module contains the template environment shared by the pages of a PypoxHTMX app.
+
+The environment is created once per application with a filesystem bytecode cache,
+so templates compiled by one process are reused by the next, and every template of
+the page tree can be compiled ahead of time when the application starts instead of
+on the first request that renders it.
+
+Page responses render only the block named by ``hx-target`` for HTMX requests, so
+a swap does not pay for the layout the browser would discard. With streaming
+enabled they are sent while they render, from an async overlay of the environment,
+so the document head and layout reach the browser before the rest of the page.
+
+The ``{% cache %}`` tag of ``pypox.fragments`` is installed in the environment and
+stores fragments in the cache of the templates.
+
+Classes:
+    - PypoxTemplates: The Jinja2 templates of a PypoxHTMX application.
+
+Functions:
+    - coalesce: Joins rendered chunks into chunks of a minimum size.
+"""
+
+from os import PathLike
+from typing import Any, AsyncIterator, Callable, Mapping, Sequence
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    TemplateError,
+)
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, Response, StreamingResponse
+from starlette.templating import Jinja2Templates
+from pypox.fragments import FragmentCache, FragmentCacheExtension
+from pypox.processing.validators.htmx import HTMXHeadersView, HTMXValidator
+import os
+
+# Other files of the page tree, like text or SVG assets, are not compiled.
+TEMPLATE_EXTENSIONS = ("html", "htm", "jinja", "jinja2", "j2")
+
+# Page responses differ between full navigations and HTMX swaps of each target.
+VARY_HEADERS = "HX-Request, HX-Target"
+
+_htmx = HTMXValidator("htmx", HTMXHeadersView)
+
+
+async def coalesce(chunks: AsyncIterator[str], size: int) -> AsyncIterator[str]:
+    """Joins rendered chunks into chunks of a minimum size.
+
+    Templates yield a chunk for every piece of text between two tags, and
+    sending each one would cost a write per chunk.
+
+    Args:
+        chunks (AsyncIterator[str]): The rendered chunks.
+        size (int): The minimum size of the joined chunks, 0 to pass every chunk through.
+
+    Yields:
+        AsyncIterator[str]: The joined chunks; the last one may be smaller.
+    """
+    buffer: list[str] = []
+    length = 0
+    async for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield "".join(buffer)
+            buffer.clear()
+            length = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+class PypoxTemplates(Jinja2Templates):
+    """The Jinja2 templates of a PypoxHTMX application.
+
+    Compiled templates are kept in the environment without a size limit, so
+    templates compiled ahead of time are never evicted. ``auto_reload`` checks the
+    template files for changes on every render and should only be enabled while
+    developing.
+
+    Streaming page responses render with ``generate_async``, which needs templates
+    compiled for an async environment. They come from ``async_env``, an overlay of
+    the environment with its own template cache and bytecode cache files, so
+    ``TemplateResponse`` keeps rendering synchronously.
+
+    Args:
+        directory (str | PathLike | Sequence[str | PathLike]): The template directories.
+        cache_directory (str | bool, optional): The bytecode cache directory, True for the
+            default temporary directory or False to disable the cache. Defaults to True.
+        auto_reload (bool, optional): Whether changed templates are recompiled. Defaults to False.
+        template_extensions (Sequence[str], optional): The file extensions compiled ahead of time. Defaults to TEMPLATE_EXTENSIONS.
+        context_processors (list[Callable[[Request], dict[str, Any]]] | None, optional):
+            Functions adding variables to the context of every template. Defaults to None.
+        fragments (bool, optional): Whether page responses render only the ``hx-target``
+            block for HTMX requests. Defaults to True.
+        fragment_cache (FragmentCache | None, optional): The cache of the ``{% cache %}`` tag.
+            Defaults to a FragmentCache in process memory.
+        streaming (bool, optional): Whether page responses are streamed. Defaults to False.
+        chunk_size (int, optional): The minimum size of the streamed chunks. Defaults to 16384.
+        **env_options (Any): Additional options of the Jinja2 environment. Jinja2
+            ``extensions`` are installed next to the ``{% cache %}`` tag.
+
+    Attributes:
+        compiled (list[str]): The names of the templates compiled ahead of time.
+        compile_errors (dict[str, Exception]): The errors of the templates that failed to compile.
+        async_env (Environment | None): The environment of streamed pages, None without streaming.
+    """
+
+    def __init__(
+        self,
+        directory: str | PathLike | Sequence[str | PathLike],
+        *,
+        cache_directory: str | bool = True,
+        auto_reload: bool = False,
+        template_extensions: Sequence[str] = TEMPLATE_EXTENSIONS,
+        context_processors: list[Callable[[Request], dict[str, Any]]] | None = None,
+        fragments: bool = True,
+        fragment_cache: FragmentCache | None = None,
+        streaming: bool = False,
+        chunk_size: int = 16384,
+        **env_options: Any,
+    ) -> None:
+        if cache_directory is True:
+            env_options.setdefault("bytecode_cache", FileSystemBytecodeCache())
+        elif cache_directory:
+            os.makedirs(cache_directory, exist_ok=True)
+            env_options.setdefault(
+                "bytecode_cache", FileSystemBytecodeCache(cache_directory)
+            )
+        env_options.setdefault("loader", FileSystemLoader(directory))
+        env_options.setdefault("autoescape", True)
+        env_options.setdefault("cache_size", -1)
+        env_options["extensions"] = [
+            *env_options.get("extensions", ()),
+            FragmentCacheExtension,
+        ]
+        env = Environment(auto_reload=auto_reload, **env_options)
+        self.template_extensions = tuple(template_extensions)
+        self.fragments = fragments
+        self.fragment_cache = (
+            fragment_cache if fragment_cache is not None else FragmentCache()
+        )
+        env.fragment_cache = self.fragment_cache  # type: ignore[attr-defined]
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        self.compiled: list[str] = []
+        self.compile_errors: dict[str, Exception] = {}
+        super().__init__(env=env, context_processors=context_processors)
+        self.async_env: Environment | None = None
+        if streaming:
+            bytecode_cache = env.bytecode_cache
+            if isinstance(bytecode_cache, FileSystemBytecodeCache):
+                # Async templates compile to different code than sync ones.
+                bytecode_cache = FileSystemBytecodeCache(
+                    bytecode_cache.directory, "__jinja2_async_%s.cache"
+                )
+            else:
+                bytecode_cache = None
+            self.async_env = env.overlay(
+                enable_async=True,
+                cache_size=env_options["cache_size"],
+                bytecode_cache=bytecode_cache,
+            )
+
+    def compile_all(self) -> list[str]:
+        """Compiles every template of the template directories.
+
+        Compiled templates are stored in the environment and, when enabled, in
+        the bytecode cache. Templates that fail to compile are skipped and their
+        errors kept in ``compile_errors``; rendering them raises the error again.
+
+        Returns:
+            list[str]: The names of the compiled templates.
+        """
+        self.compiled = []
+        self.compile_errors = {}
+        for name in self.env.list_templates(extensions=self.template_extensions):
+            try:
+                self.env.get_template(name)
+                if self.async_env is not None:
+                    self.async_env.get_template(name)
+            except TemplateError as exc:
+                self.compile_errors[name] = exc
+            else:
+                self.compiled.append(name)
+        return self.compiled
+
+    def fragment(self, request: Request, template: Template) -> str | None:
+        """Returns the block of a template targeted by an HTMX request.
+
+        The ``hx-target`` id names the block, with dashes read as underscores.
+        Only blocks defined in the template itself are rendered on their own;
+        blocks inherited unchanged from a layout render the full page.
+
+        Args:
+            request (Request): The request.
+            template (Template): The page template.
+
+        Returns:
+            str | None: The block name, or None to render the full page.
+        """
+        if not self.fragments:
+            return None
+        headers = _htmx.extract(request)
+        if headers.request != "true" or not headers.target:
+            return None
+        block = headers.target.lstrip("#").replace("-", "_")
+        return block if block in template.blocks else None
+
+    def PageResponse(
+        self,
+        request: Request,
+        name: str,
+        context: Mapping[str, Any] | None = None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+        stream: bool | None = None,
+    ) -> Response:
+        """Renders a page, or only the targeted block for HTMX requests.
+
+        Normal navigations get the full page from ``TemplateResponse``. HTMX
+        requests whose ``hx-target`` names a block of the template get that block
+        alone, rendered with the same context. Streamed pages and blocks are sent
+        in chunks of at least ``chunk_size`` characters while they render.
+
+        Args:
+            request (Request): The request.
+            name (str): The name of the page template.
+            context (Mapping[str, Any] | None, optional): The template context. Defaults to None.
+            status_code (int, optional): The status code. Defaults to 200.
+            headers (Mapping[str, str] | None, optional): The response headers. Defaults to None.
+            media_type (str | None, optional): The media type. Defaults to None.
+            background (BackgroundTask | None, optional): The background task. Defaults to None.
+            stream (bool | None, optional): Whether the response is streamed. Defaults to ``streaming``.
+
+        Raises:
+            RuntimeError: If the response is streamed without streaming enabled.
+
+        Returns:
+            Response: The rendered page or fragment.
+        """
+        headers = {"vary": VARY_HEADERS, **(headers or {})}
+        if self.streaming if stream is None else stream:
+            if self.async_env is None:
+                raise RuntimeError("Streaming requires PypoxTemplates(streaming=True)")
+            template = self.async_env.get_template(name)
+            block = self.fragment(request, template)
+            variables = self._context(request, context)
+            if block is None:
+                chunks = template.generate_async(variables)
+            else:
+                chunks = template.blocks[block](template.new_context(variables))
+            return StreamingResponse(
+                coalesce(chunks, self.chunk_size),
+                status_code=status_code,
+                headers=headers,
+                media_type=media_type or HTMLResponse.media_type,
+                background=background,
+            )
+        template = self.get_template(name)
+        block = self.fragment(request, template)
+        if block is None:
+            return self.TemplateResponse(
+                request,
+                name,
+                dict(context or {}),
+                status_code=status_code,
+                headers=headers,
+                media_type=media_type,
+                background=background,
+            )
+        variables = self._context(request, context)
+        content = "".join(template.blocks[block](template.new_context(variables)))
+        return HTMLResponse(
+            content,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            background=background,
+        )
+
+    def _context(
+        self, request: Request, context: Mapping[str, Any] | None
+    ) -> dict[str, Any]:
+        variables = dict(context or {})
+        variables.setdefault("request", request)
+        for context_processor in self.context_processors:
+            variables.update(context_processor(request))
+        return variables
@@ -0,0 +1,15 @@
+import asyncio
+from benchmarks.__main__ import cases
+from benchmarks.harness import measure
+
+
+def test_every_case_runs():
+    async def run():
+        return [
+            await measure(case.name, case.app, case.scope, 5, case.body, 2)
+            for case in cases([3], [2])
+        ]
+
+    results = asyncio.run(run())
+    assert len({result.name for result in results}) == len(results)
+    assert all(result.rps > 0 for result in results)
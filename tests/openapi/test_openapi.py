@@ -0,0 +1,150 @@
+import os
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.testclient import TestClient
+from pypox._types import HeaderStr, PathInt, QueryInt
+from pypox.application import Pypox
+from pypox.processing.base import processor
+from pypox.router import HTTPRouter
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+
+
+@processor()
+async def read_item(item_id: PathInt, limit: QueryInt, x_token: HeaderStr):
+    """Reads an item.
+
+    Returns the item with the given id.
+    """
+    return {"id": item_id}
+
+
+@processor()
+async def create_item(item: Item):
+    return item.model_dump()
+
+
+def create_app() -> Pypox:
+    app = Pypox(
+        conventions=[
+            HTTPRouter(os.path.dirname(__file__) + "/../routing/app"),
+        ]
+    )
+    app.add_route("/items/{item_id:int}", read_item, methods=["GET"])
+    app.add_route("/items", create_item, methods=["POST"])
+    return app
+
+
+class TestOpenAPI:
+
+    def test_document(self):
+        client = TestClient(create_app())
+        document = client.get("/openapi.json").json()
+        assert document["openapi"] == "3.0.3"
+        assert document["info"]["title"] == "Pypox"
+        assert "/openapi.json" not in document["paths"]
+        assert set(document["paths"]["/"]) >= {"get", "post", "put", "delete"}
+        assert document["paths"]["/{name}/"]["get"]["parameters"] == [
+            {
+                "name": "name",
+                "in": "path",
+                "required": True,
+                "schema": {"type": "string"},
+            }
+        ]
+
+        read = document["paths"]["/items/{item_id}"]["get"]
+        assert read["summary"] == "Reads an item."
+        assert read["parameters"] == [
+            {
+                "name": "item_id",
+                "in": "path",
+                "required": True,
+                "schema": {"type": "integer"},
+            },
+            {"name": "limit", "in": "query", "schema": {"type": "integer"}},
+            {"name": "x-token", "in": "header", "schema": {"type": "string"}},
+        ]
+
+        create = document["paths"]["/items"]["post"]
+        assert create["requestBody"]["content"]["application/json"]["schema"] == {
+            "$ref": "#/components/schemas/Item"
+        }
+        assert document["components"]["schemas"]["Item"]["required"] == [
+            "name",
+            "price",
+        ]
+
+    def test_cached_variants(self):
+        app = create_app()
+        client = TestClient(app)
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "identity"})
+        assert response.headers["content-type"] == "application/json"
+        body = app.openapi.body
+        assert response.content == body
+        assert app.openapi.body is body
+
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == body
+
+        etag = response.headers["etag"]
+        assert etag == app.openapi.etag
+        response = client.get("/openapi.json", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_invalidated_by_new_routes(self):
+        app = create_app()
+        client = TestClient(app)
+        etag = client.get("/openapi.json").headers["etag"]
+
+        async def extra(request):
+            pass
+
+        app.add_route("/extra", extra, methods=["GET"])
+        response = client.get("/openapi.json")
+        assert response.headers["etag"] != etag
+        assert "/extra" in response.json()["paths"]
+
+    def test_invalidated_by_reloads(self, tmp_path):
+        source = (
+            "from pypox._types import QueryStr\n"
+            "from pypox.processing.base import processor\n\n\n"
+            "@processor()\n"
+            "async def endpoint({name}: QueryStr):\n"
+            "    return {{}}\n"
+        )
+        for radix in [False, True]:
+            directory = tmp_path / str(radix)
+            directory.mkdir()
+            (directory / "get.py").write_text(source.format(name="a"))
+            router = HTTPRouter(str(directory), radix=radix)
+            client = TestClient(Pypox(conventions=[router]))
+
+            def parameters():
+                operation = client.get("/openapi.json").json()["paths"]["/"]["get"]
+                return [parameter["name"] for parameter in operation["parameters"]]
+
+            assert parameters() == ["a"]
+            (directory / "get.py").write_text(source.format(name="b"))
+            router.reload_modules([str(directory / "get.py")])
+            assert parameters() == ["b"]
+
+    def test_disabled(self):
+        client = TestClient(Pypox(openapi_url=None))
+        assert client.get("/openapi.json").status_code == 404
+
+    def test_metadata(self):
+        app = Pypox()
+
+        async def endpoint(request: Request):
+            assert "openapi" not in request.scope
+            return JSONResponse({"title": request.app.openapi_metadata["info"].title})
+
+        app.add_route("/", endpoint, methods=["GET"])
+        assert app.openapi_metadata["openapi"] == "3.0.3"
+        assert TestClient(app).get("/").json()["title"] == "Pypox"
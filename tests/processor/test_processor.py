@@ -28,6 +28,7 @@ from starlette.exceptions import HTTPException
 
 from pypox.processing.validators.htmx import (
     HTMXHeaders,
+    HTMXHeadersView,
     HTMXResponseHeaders,
     HTMXValidator,
 )
@@ -340,12 +341,19 @@ def htmx_client():
     async def htmx_request(htmx: HTMXHeaders) -> JSONResponse:
         return JSONResponse(htmx.model_dump())
 
+    @processor([HTMXValidator])
+    async def htmx_view(htmx: HTMXHeadersView) -> JSONResponse:
+        return JSONResponse(
+            {"request": htmx.request, "target": htmx.target, "boosted": htmx.boosted}
+        )
+
     async def htmx_response(request: Request) -> JSONResponse:
         return JSONResponse(HTMXResponseHeaders(**request.headers).model_dump())
 
     app = Starlette()
 
     app.add_route("/", htmx_request, methods=["GET"])  # type: ignore
+    app.add_route("/view", htmx_view, methods=["GET"])  # type: ignore
     app.add_route("/response", processor()(htmx_response), methods=["GET"])
 
     return TestClient(app)
@@ -556,6 +564,25 @@ class TestHTMX:
             "trigger": "trigger",
         }
 
+    def test_htmx_headers_view(self, htmx_client: TestClient):
+        response = htmx_client.get(
+            "/view", headers={"HX-Request": "true", "HX-Target": "target"}
+        )
+        assert response.json() == {
+            "request": "true",
+            "target": "target",
+            "boosted": "false",
+        }
+
+    def test_htmx_headers_view_is_lazy(self):
+        view = HTMXHeadersView(
+            [(b"host", b"testserver"), (b"hx-request", b"true"), (b"hx-target", b"t")]
+        )
+        assert view._values is None
+        assert view.request == "true"
+        assert view.values == {"hx-request": "true", "hx-target": "t"}
+        assert view.model() == HTMXHeaders(**{"hx-request": "true", "hx-target": "t"})
+
     def test_htmx_response_headers(self, htmx_client: TestClient):
         response = htmx_client.get(
             "/response",
@@ -586,3 +613,162 @@ class TestHTMX:
             "trigger_after_settle": "http://localhost:8000",
             "trigger_after_swap": "http://localhost:8000",
         }
+
+
+class TestProcessorPlan:
+
+    def test_plan_is_compiled_once(self):
+        async def endpoint(
+            request: Request, name_str: QueryStr, quantity: PathInt, body: BodyDict
+        ) -> JSONResponse:
+            return JSONResponse({})
+
+        wrapper = processor()(endpoint)
+        assert [(step.name, step.source, step.alias) for step in wrapper.plan] == [
+            ("request", "request", "request"),
+            ("name_str", "query", "name-str"),
+            ("quantity", "path", "quantity"),
+            ("body", "body", "body"),
+        ]
+        assert wrapper.plan[2].converter is int
+        assert not wrapper.plan[1].is_async
+        assert wrapper.plan[3].is_async
+
+    def test_falsy_values_are_passed(self):
+        @processor()
+        async def endpoint(quantity: QueryInt) -> JSONResponse:
+            return JSONResponse({"quantity": quantity})
+
+        app = Starlette()
+        app.add_route("/", endpoint, methods=["GET"])
+        response = TestClient(app).get("/?quantity=0")
+        assert response.status_code == 200
+        assert response.json() == {"quantity": 0}
+
+    def test_registered_validator(self):
+        from typing import NewType
+        from pypox.processing.registry import ValidatorRegistry, default_registry
+        from pypox.processing.validators.base import Validator
+
+        Token = NewType("Token", str)
+
+        class TokenValidator(Validator):
+            types = (Token,)
+            source = "header"
+
+            def extract(self, request: Request) -> str | None:
+                return request.headers.get("x-token")
+
+        registry = default_registry.extend([TokenValidator])
+        assert registry.resolve(Token) is TokenValidator
+        assert Token not in default_registry
+
+        @processor(registry=registry)
+        async def endpoint(token: Token, name: QueryStr) -> JSONResponse:
+            return JSONResponse({"token": token, "name": name})
+
+        assert [step.source for step in endpoint.plan] == ["header", "query"]
+        app = Starlette()
+        app.add_route("/", endpoint, methods=["GET"])
+        response = TestClient(app).get("/?name=apple", headers={"x-token": "abc"})
+        assert response.json() == {"token": "abc", "name": "apple"}
+
+    def test_dict_return_is_rendered_with_orjson(self):
+        from dataclasses import dataclass
+        from datetime import datetime
+
+        @dataclass
+        class Item:
+            name: str
+            created: datetime
+
+        @processor()
+        async def endpoint(body: BodyDict) -> dict:
+            return {"item": Item(body["name"], datetime(2024, 1, 1))}
+
+        app = Starlette()
+        app.add_route("/", endpoint, methods=["POST"])
+        client = TestClient(app)
+        response = client.post("/", json={"name": "apple"})
+        assert response.status_code == 200
+        assert response.json() == {
+            "item": {"name": "apple", "created": "2024-01-01T00:00:00"}
+        }
+        assert client.post("/", content=b"{").status_code == 400
+
+    def test_legacy_validator_subclassing_builtin(self):
+        from pypox.processing.validators.header import HeaderValidator
+
+        class Token(str):
+            pass
+
+        class TokenValidator(HeaderValidator):
+            async def validate(self, _type, request):
+                if _type is not Token:
+                    return None
+                return Token(request.headers.get("authorization", ""))
+
+        @processor([TokenValidator])
+        async def endpoint(token: Token, user_agent: HeaderStr) -> dict:
+            return {"token": token, "user_agent": user_agent}
+
+        app = Starlette()
+        app.add_route("/", endpoint, methods=["GET"])
+        response = TestClient(app).get(
+            "/", headers={"authorization": "abc", "user-agent": "tests"}
+        )
+        assert response.json() == {"token": "abc", "user_agent": "tests"}
+
+    def test_response_class_default(self):
+        from decimal import Decimal
+        from pypox.responses import PypoxJSONResponse
+
+        def encode(obj):
+            return str(obj)
+
+        class DecimalResponse(PypoxJSONResponse):
+            default = encode
+
+        class StaticDecimalResponse(PypoxJSONResponse):
+            default = staticmethod(encode)
+
+        for response_class in (DecimalResponse, StaticDecimalResponse):
+
+            @processor(response_class=response_class)
+            async def endpoint() -> dict:
+                return {"price": Decimal("1.50")}
+
+            app = Starlette()
+            app.add_route("/", endpoint, methods=["GET"])
+            assert TestClient(app).get("/").json() == {"price": "1.50"}
+
+    def test_pydantic_model_body(self):
+        from pydantic import BaseModel
+
+        class Item(BaseModel):
+            name: str
+            quantity: int
+
+        @processor()
+        async def endpoint(item: Item) -> dict:
+            return item.model_dump()
+
+        assert endpoint.plan[0].source == "body"
+        app = Starlette()
+        app.add_route("/", endpoint, methods=["POST"])
+        client = TestClient(app)
+        response = client.post("/", json={"name": "apple", "quantity": "2"})
+        assert response.json() == {"name": "apple", "quantity": 2}
+        response = client.post("/", json={"name": "apple"})
+        assert response.status_code == 422
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {
+            "detail": [
+                {
+                    "type": "missing",
+                    "loc": ["quantity"],
+                    "msg": "Field required",
+                    "input": {"name": "apple"},
+                }
+            ]
+        }
@@ -1,6 +1,8 @@
+from contextlib import asynccontextmanager
 from pypox.application import Pypox
 from pypox.router import HTTPRouter, WebsocketRouter
 import os
+import pytest
 from starlette.testclient import TestClient
 
 app = Pypox(
@@ -120,3 +122,296 @@ class TestWebSocketEndpoint(TestPypoxClient):
             # send data
             websocket.send_text("Hello, world!")
             assert websocket.receive_text() == "Message text was: Hello, world!"
+
+
+class TestRouteManifest:
+
+    def test_manifest_skips_walk(self, tmp_path, monkeypatch):
+        manifest = str(tmp_path / "routes.json")
+        directory = os.path.dirname(__file__) + "/app"
+        router = HTTPRouter(directory, manifest=manifest)
+        assert os.path.exists(manifest)
+
+        def walk(*args, **kwargs):
+            raise AssertionError("directory walked")
+
+        monkeypatch.setattr(os, "walk", walk)
+        cached = HTTPRouter(directory, manifest=manifest)
+        assert [(r.path, r.methods) for r in cached.routes] == [
+            (r.path, r.methods) for r in router.routes
+        ]
+
+    def test_manifest_is_invalidated(self, tmp_path):
+        manifest = str(tmp_path / "routes.json")
+        (tmp_path / "app").mkdir()
+        (tmp_path / "app" / "get.py").write_text("async def endpoint(): pass\n")
+        assert len(HTTPRouter(str(tmp_path / "app"), manifest=manifest).routes) == 1
+        (tmp_path / "app" / "items").mkdir()
+        (tmp_path / "app" / "items" / "get.py").write_text(
+            "async def endpoint(): pass\n"
+        )
+        assert len(HTTPRouter(str(tmp_path / "app"), manifest=manifest).routes) == 2
+
+    def test_unwritable_manifest(self, tmp_path):
+        (tmp_path / "app").mkdir()
+        (tmp_path / "app" / "get.py").write_text("async def endpoint(): pass\n")
+        (tmp_path / "routes.json").mkdir()
+        for manifest in [
+            str(tmp_path / "missing" / "routes.json"),
+            str(tmp_path / "routes.json"),
+        ]:
+            router = HTTPRouter(str(tmp_path / "app"), manifest=manifest)
+            assert len(router.routes) == 1
+        assert sorted(os.listdir(tmp_path)) == ["app", "routes.json"]
+
+    def test_modules_are_loaded_once(self):
+        router = HTTPRouter(os.path.dirname(__file__) + "/app")
+        module_path = os.path.dirname(__file__) + "/app/get.py"
+        assert router.load_module("get", module_path) is router.load_module(
+            "get", module_path
+        )
+
+
+class TestLazyRouter:
+
+    def test_lazy_import(self):
+        router = HTTPRouter(os.path.dirname(__file__) + "/app", lazy=True)
+        websocket_router = WebsocketRouter(
+            os.path.dirname(__file__) + "/app", lazy=True
+        )
+        client = TestClient(Pypox(conventions=[router, websocket_router]))
+        assert router.lazy_endpoints
+        assert not any(endpoint.loaded for endpoint in router.lazy_endpoints)
+        assert client.get("/").status_code == 200
+        assert client.post("/httpendpoint").status_code == 200
+        assert sum(endpoint.loaded for endpoint in router.lazy_endpoints) == 2
+        with client.websocket_connect("/") as websocket:
+            assert websocket.receive_text() == "Hello, world!"
+
+    def test_warm_up(self):
+        router = HTTPRouter(os.path.dirname(__file__) + "/app", lazy=True, warm_up=True)
+        assert router.warms_up
+        with TestClient(Pypox(conventions=[router])) as client:
+            client.portal.call(router.warm_up)
+            assert all(endpoint.loaded for endpoint in router.lazy_endpoints)
+
+
+class TestParallelLoading:
+
+    def test_parallel_load_keeps_order(self):
+        directory = os.path.dirname(__file__) + "/app"
+        sequential = HTTPRouter(directory)
+        parallel = HTTPRouter(directory, load_workers=4)
+        assert [(r.path, r.methods) for r in parallel.routes] == [
+            (r.path, r.methods) for r in sequential.routes
+        ]
+        assert [timing.module_path for timing in parallel.load_report] == [
+            timing.module_path for timing in sequential.load_report
+        ]
+        assert all(timing.seconds >= 0 for timing in parallel.load_report)
+
+
+class TestRadixRouter:
+    client = TestClient(
+        Pypox(
+            conventions=[
+                HTTPRouter(os.path.dirname(__file__) + "/app", radix=True),
+                WebsocketRouter(os.path.dirname(__file__) + "/app", radix=True),
+            ]
+        )
+    )
+
+    def test_methods(self):
+        for method in ["get", "post", "put", "delete", "patch", "head", "options"]:
+            assert getattr(self.client, method)("/").status_code == 200
+            assert getattr(self.client, method)("/1").status_code == 200
+            assert getattr(self.client, method)("/query/?number=1").status_code == 200
+            assert getattr(self.client, method)("/httpendpoint").status_code == 200
+
+    def test_static_segments_take_precedence(self):
+        assert self.client.get("/query/").text == "GET request failed."
+
+    def test_not_found(self):
+        assert self.client.get("/1/2/3").status_code == 404
+
+    def test_websocket(self):
+        with self.client.websocket_connect("/") as websocket:
+            assert websocket.receive_text() == "Hello, world!"
+
+    def test_tree_lookup(self):
+        from pypox.radix import RadixTree
+
+        tree = RadixTree()
+        tree.insert("/users/{id:int}/").value = "user"
+        tree.insert("/users/me/").value = "me"
+        tree.insert("/users/{name}/").value = "name"
+        tree.insert("/users/me/settings/").value = "settings"
+        assert list(tree.lookup("/users/me/")) == [("me", {}), ("name", {"name": "me"})]
+        assert next(tree.lookup("/users/1/")) == ("user", {"id": 1})
+        assert next(tree.lookup("/users/me/settings/")) == ("settings", {})
+        assert list(tree.lookup("/users/")) == []
+
+
+class TestMethodRoute:
+
+    def test_one_route_per_directory(self):
+        router = HTTPRouter(os.path.dirname(__file__) + "/app")
+        paths = [route.path for route in router.routes]
+        assert len(paths) == len(set(paths))
+        root = next(route for route in router.routes if route.path == "/")
+        assert set(root.endpoints) == {
+            "GET",
+            "POST",
+            "PUT",
+            "DELETE",
+            "PATCH",
+            "OPTIONS",
+        }
+
+    def test_method_not_allowed(self, tmp_path):
+        (tmp_path / "get.py").write_text(
+            "from starlette.responses import PlainTextResponse\n\n\n"
+            "async def endpoint(request):\n"
+            "    return PlainTextResponse('GET')\n"
+        )
+        for radix in [False, True]:
+            client = TestClient(
+                Pypox(conventions=[HTTPRouter(str(tmp_path), radix=radix)])
+            )
+            assert client.get("/").text == "GET"
+            assert client.head("/").status_code == 200
+            response = client.post("/")
+            assert response.status_code == 405
+            assert response.headers["allow"] == "GET, HEAD"
+
+
+class TestRouteReload:
+
+    ENDPOINT = (
+        "from starlette.responses import PlainTextResponse\n\n\n"
+        "async def endpoint(request):\n"
+        "    return PlainTextResponse({text!r})\n"
+    )
+
+    def test_reload_modules(self, tmp_path):
+        (tmp_path / "get.py").write_text(self.ENDPOINT.format(text="v1"))
+        router = HTTPRouter(str(tmp_path), reload=True)
+        client = TestClient(Pypox(conventions=[router]))
+        assert client.get("/").text == "v1"
+
+        (tmp_path / "get.py").write_text(self.ENDPOINT.format(text="version 2"))
+        (tmp_path / "items").mkdir()
+        (tmp_path / "items" / "post.py").write_text(self.ENDPOINT.format(text="new"))
+        router.reload_modules(
+            [str(tmp_path / "get.py"), str(tmp_path / "items" / "post.py")]
+        )
+        assert client.get("/").text == "version 2"
+        assert client.post("/items/").text == "new"
+
+        (tmp_path / "items" / "post.py").unlink()
+        (tmp_path / "get.py").write_text("syntax error(")
+        router.reload_modules(
+            [str(tmp_path / "get.py"), str(tmp_path / "items" / "post.py")]
+        )
+        assert client.get("/").text == "version 2"
+        assert str(tmp_path / "get.py") in router.reload_errors
+        assert client.post("/items/").status_code == 404
+
+    def test_reload_radix(self, tmp_path):
+        (tmp_path / "get.py").write_text(self.ENDPOINT.format(text="root"))
+        router = HTTPRouter(str(tmp_path), radix=True)
+        client = TestClient(Pypox(conventions=[router]))
+        (tmp_path / "[id]").mkdir()
+        (tmp_path / "[id]" / "get.py").write_text(self.ENDPOINT.format(text="item"))
+        router.reload_modules([str(tmp_path / "[id]" / "get.py")])
+        assert client.get("/1/").text == "item"
+        (tmp_path / "[id]" / "get.py").unlink()
+        router.reload_modules([str(tmp_path / "[id]" / "get.py")])
+        assert client.get("/1/").status_code == 404
+        assert client.get("/").text == "root"
+
+    def test_reload_method_in_place(self, tmp_path):
+        for radix in [False, True]:
+            directory = tmp_path / str(radix)
+            (directory / "x").mkdir(parents=True)
+            (directory / "[id]").mkdir()
+            (directory / "x" / "get.py").write_text(self.ENDPOINT.format(text="x-get"))
+            (directory / "[id]" / "post.py").write_text(
+                self.ENDPOINT.format(text="id-post")
+            )
+            router = HTTPRouter(str(directory), radix=radix)
+            client = TestClient(Pypox(conventions=[router]))
+            assert client.post("/x/").text == "id-post"
+            (directory / "x" / "post.py").write_text(
+                self.ENDPOINT.format(text="x-post")
+            )
+            router.reload_modules([str(directory / "x" / "post.py")])
+            assert client.post("/x/").text == "x-post"
+            (directory / "x" / "post.py").unlink()
+            router.reload_modules([str(directory / "x" / "post.py")])
+            assert client.post("/x/").text == "id-post"
+            assert client.get("/x/").text == "x-get"
+
+    def test_watcher_relative_directory(self, tmp_path, monkeypatch):
+        import time
+        from pypox import reload
+
+        if reload.watchfiles is None:
+            pytest.skip("watchfiles is not installed")
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "app").mkdir()
+        (tmp_path / "app" / "get.py").write_text(self.ENDPOINT.format(text="v1"))
+        router = HTTPRouter("app", reload=True, reload_interval=0.05)
+        app = Pypox(conventions=[router])
+        with TestClient(app) as client:
+            assert client.get("/").text == "v1"
+            (tmp_path / "app" / "get.py").write_text(self.ENDPOINT.format(text="v2"))
+            deadline = time.monotonic() + 10
+            while client.get("/").text != "v2" and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert client.get("/").text == "v2"
+        assert [route.path for route in router.routes] == ["/"]
+
+    def test_hooks_run_with_lifespan(self, tmp_path):
+        (tmp_path / "get.py").write_text(self.ENDPOINT.format(text="v1"))
+        events = []
+
+        @asynccontextmanager
+        async def lifespan(app):
+            events.append("startup")
+            yield
+            events.append("shutdown")
+
+        router = HTTPRouter(str(tmp_path), reload=True, lazy=True, warm_up=True)
+        app = Pypox(conventions=[router], lifespan=lifespan)
+        with TestClient(app) as client:
+            assert events == ["startup"]
+            assert router._watcher.running
+            assert router._warm_up_task is not None
+            assert client.get("/").text == "v1"
+        assert events == ["startup", "shutdown"]
+        assert not router._watcher.running
+
+    def test_polling_watcher(self, tmp_path):
+        import threading
+        from pypox.reload import RouteWatcher
+
+        (tmp_path / "get.py").write_text("")
+        changed = []
+        event = threading.Event()
+        watcher = RouteWatcher(
+            str(tmp_path),
+            ["get.py"],
+            lambda paths: (changed.append(paths), event.set()),
+            interval=0.01,
+            force_polling=True,
+        )
+        watcher.start()
+        try:
+            (tmp_path / "post.py").write_text("")
+            (tmp_path / "other.txt").write_text("")
+            (tmp_path / "get.py").unlink()
+            assert event.wait(5)
+        finally:
+            watcher.stop()
+        assert changed[0] == {str(tmp_path / "get.py")}
@@ -1,8 +1,18 @@
 import base64
+import threading
+import time
+import orjson
 import pytest
 from starlette.applications import Starlette
 from starlette.requests import Request
-from pypox.authentication import BearerTokenMiddleware, BasicTokenMiddleware
+from pypox.authentication import (
+    BearerTokenMiddleware,
+    BasicTokenMiddleware,
+    KeySet,
+    TokenCache,
+    VerificationPool,
+)
+from pypox.routeset import RouteSet
 from starlette.responses import JSONResponse
 from starlette.testclient import TestClient
 from jose import jwt
@@ -56,6 +66,20 @@ def basic_client():
     return TestClient(app)
 
 
+@pytest.fixture
+def auth_client():
+    async def protected_route(request: Request) -> JSONResponse:
+        return JSONResponse({"user": request.state.user})
+
+    def client(middleware, **options) -> TestClient:
+        app = Starlette()
+        app.add_middleware(middleware, routes=["/protected"], **options)
+        app.add_route("/protected", protected_route, methods=["GET"])
+        return TestClient(app)
+
+    return client
+
+
 class TestBearerTokenMiddleware:
 
     def test_authentication(self, bearer_client: TestClient):
@@ -85,7 +109,7 @@ class TestBasicTokenMiddleware:
         assert response.status_code == 200
         assert response.json() == {
             "detail": "Authenticated",
-            "user": {"username": "username", "password": "password"},
+            "user": {"username": "username"},
         }
 
     def test_public_authentication(self, basic_client: TestClient):
@@ -94,3 +118,260 @@ class TestBasicTokenMiddleware:
         assert response.json() == {
             "detail": "Public",
         }
+
+
+class TestBasicValidation:
+
+    @staticmethod
+    def headers(username: str, password: str) -> dict:
+        credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+        return {"Authorization": f"Basic {credentials}"}
+
+    def test_async_validator(self, auth_client):
+        async def validator(username: str, password: str) -> bool:
+            return password == "password"
+
+        client = auth_client(BasicTokenMiddleware, validator=validator)
+        response = client.get("/protected", headers=self.headers("user", "password"))
+        assert response.json() == {"user": {"username": "user"}}
+        response = client.get("/protected", headers=self.headers("user", "wrong"))
+        assert response.status_code == 401
+
+    def test_sync_validator_runs_in_thread(self, auth_client):
+        threads = []
+
+        def validator(username: str, password: str) -> bool:
+            threads.append(threading.current_thread())
+            return True
+
+        client = auth_client(BasicTokenMiddleware, validator=validator)
+        client.get("/protected", headers=self.headers("user", "password"))
+        assert threads and threads[0] is not threading.main_thread()
+
+    def test_cached_validation(self, auth_client):
+        calls = []
+
+        def validator(username: str, password: str) -> bool:
+            calls.append(username)
+            return password == "password"
+
+        client = auth_client(BasicTokenMiddleware, validator=validator, cache_size=8)
+        for _ in range(3):
+            response = client.get(
+                "/protected", headers=self.headers("user", "password")
+            )
+            assert response.json() == {"user": {"username": "user"}}
+        for _ in range(2):
+            response = client.get("/protected", headers=self.headers("user", "wrong"))
+            assert response.status_code == 401
+        assert calls == ["user"] * 3
+
+    def test_malformed_header(self, auth_client):
+        client = auth_client(
+            BasicTokenMiddleware, validator=lambda username, password: True
+        )
+        assert client.get("/protected").status_code == 401
+        response = client.get("/protected", headers={"Authorization": "Basic %%%"})
+        assert response.status_code == 401
+
+
+class TestBearerRouteIndex:
+
+    def test_invalid_token(self, bearer_client: TestClient):
+        response = bearer_client.get(
+            "/protected", headers={"Authorization": "Bearer invalid"}
+        )
+        assert response.status_code == 401
+        assert bearer_client.get("/protected").status_code == 401
+
+    def test_no_substring_match(self, bearer_client: TestClient):
+        # "/" and "/prot" used to match because they are substrings of "/protected"
+        assert bearer_client.get("/prot").status_code == 404
+
+    def test_prefix_routes(self):
+        index = RouteSet(["/protected", "/admin/*"])
+        assert "/protected/" in index
+        assert "/protected/child" not in index
+        assert "/admin" in index
+        assert "/admin/users/1" in index
+        assert "/administrator" not in index
+        assert "/" not in index
+
+
+class TestTokenCache:
+
+    def test_cached_verification(self, auth_client, monkeypatch):
+        client = auth_client(
+            BearerTokenMiddleware, secret_key="secret", algorithm="HS256", cache_size=2
+        )
+        token = jwt.encode({"payload": "data"}, "secret", algorithm="HS256")
+        headers = {"Authorization": f"Bearer {token}"}
+        assert client.get("/protected", headers=headers).json() == {
+            "user": {"payload": "data"}
+        }
+
+        def decode(*args, **kwargs):
+            raise AssertionError("token verified again")
+
+        monkeypatch.setattr(jwt, "decode", decode)
+        assert client.get("/protected", headers=headers).json() == {
+            "user": {"payload": "data"}
+        }
+
+    def test_expiry_and_eviction(self):
+        cache = TokenCache(maxsize=2, ttl=60)
+        cache.set("expired", {"exp": time.time() - 1})
+        assert cache.get("expired") is None
+        cache.set("a", {"sub": "a"})
+        cache.set("b", {"sub": "b"})
+        assert cache.get("a") == {"sub": "a"}
+        cache.set("c", {"sub": "c"})
+        assert cache.get("b") is None
+        assert cache.get("c") == {"sub": "c"}
+        assert (cache.hits, cache.misses) == (2, 2)
+        assert len(cache) == 2
+
+
+class TestVerificationPool:
+
+    def test_pool_verification(self, auth_client):
+        pool = VerificationPool(max_workers=2)
+        client = auth_client(
+            BearerTokenMiddleware, secret_key="secret", algorithm="HS256", pool=pool
+        )
+        token = jwt.encode({"payload": "data"}, "secret", algorithm="HS256")
+        response = client.get(
+            "/protected", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.json() == {"user": {"payload": "data"}}
+        response = client.get("/protected", headers={"Authorization": "Bearer bad"})
+        assert response.status_code == 401
+        metrics = pool.metrics()
+        assert metrics["completed"] == 2
+        assert metrics["queue_depth"] == metrics["in_flight"] == 0
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        pool = VerificationPool(max_workers=1, queue_timeout=0.01)
+        await pool._semaphore.acquire()
+        token = jwt.encode({"payload": "data"}, "secret", algorithm="HS256")
+        with pytest.raises(TimeoutError):
+            await pool.decode(token, "secret", ["HS256"])
+        assert pool.metrics()["rejected"] == 1
+        pool._semaphore.release()
+        assert await pool.decode(token, "secret", ["HS256"]) == {"payload": "data"}
+        pool.shutdown()
+
+
+class TestKeySet:
+
+    @staticmethod
+    def oct_key(kid: str, secret: str) -> dict:
+        k = base64.urlsafe_b64encode(secret.encode()).rstrip(b"=").decode()
+        return {"kty": "oct", "kid": kid, "alg": "HS256", "k": k}
+
+    def test_kid_lookup_and_rotation(self, auth_client):
+        document = {"keys": [self.oct_key("a", "secret-a")]}
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return document
+
+        keys = KeySet(loader=loader, min_refresh_interval=0)
+        client = auth_client(BearerTokenMiddleware, keys=keys)
+
+        def get(secret: str, kid: str):
+            token = jwt.encode(
+                {"sub": kid}, secret, algorithm="HS256", headers={"kid": kid}
+            )
+            return client.get(
+                "/protected", headers={"Authorization": f"Bearer {token}"}
+            )
+
+        assert get("secret-a", "a").json() == {"user": {"sub": "a"}}
+        assert get("secret-a", "a").status_code == 200
+        assert len(loads) == 1
+        assert get("secret-b", "b").status_code == 401
+        document["keys"].append(self.oct_key("b", "secret-b"))
+        assert get("secret-b", "b").json() == {"user": {"sub": "b"}}
+        assert get("wrong", "a").status_code == 401
+
+    def test_rate_limited_refresh(self, tmp_path):
+        path = tmp_path / "jwks.json"
+        path.write_bytes(orjson.dumps({"keys": [self.oct_key("a", "secret-a")]}))
+        keys = KeySet(path=str(path), min_refresh_interval=3600)
+        assert keys.get("a") is not None
+        path.write_bytes(orjson.dumps({"keys": [self.oct_key("b", "secret-b")]}))
+        assert keys.get("b") is None
+        keys.load()
+        assert "b" in keys and "a" not in keys
+
+    def test_failed_refresh(self, auth_client):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            if len(calls) > 1:
+                raise OSError("unavailable")
+            return {"keys": [self.oct_key("a", "secret-a")]}
+
+        keys = KeySet(loader=loader, min_refresh_interval=3600)
+        client = auth_client(BearerTokenMiddleware, keys=keys)
+        keys.load()
+        keys._loaded_at = None
+        token = jwt.encode({"sub": "b"}, "secret-b", headers={"kid": "b"})
+        for _ in range(3):
+            response = client.get(
+                "/protected", headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 401
+        assert len(calls) == 2
+        assert "a" in keys
+
+    def test_key_without_alg(self, auth_client):
+        key = self.oct_key("a", "secret-a")
+        del key["alg"]
+        keys = KeySet(loader=lambda: {"keys": [key, {"kty": "unknown", "kid": "x"}]})
+        client = auth_client(BearerTokenMiddleware, keys=keys, algorithm="HS256")
+        token = jwt.encode({"sub": "a"}, "secret-a", headers={"kid": "a"})
+        response = client.get(
+            "/protected", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.json() == {"user": {"sub": "a"}}
+        assert "x" not in keys
+
+    def test_requires_key(self):
+        with pytest.raises(ValueError):
+            BearerTokenMiddleware(Starlette(), routes=["/protected"])
+
+
+class TestRouteSet:
+
+    def test_templates(self):
+        routes = RouteSet(["/users/{id:int}", "/files/{name:path}", "/"])
+        assert routes.match("/users/5") == "/users/{id:int}"
+        assert "/users/me" not in routes
+        assert "/users/5/posts" not in routes
+        assert routes.match("/files/a/b.txt") == "/files/{name:path}"
+        assert "/" in routes and "/other" not in routes
+
+    def test_shared_by_middleware(self):
+        routes = RouteSet(["/items/{id}"])
+        app = Starlette()
+        app.add_middleware(
+            BasicTokenMiddleware,
+            routes=routes,
+            validator=lambda username, password: password == "password",
+        )
+        app.add_middleware(BearerTokenMiddleware, secret_key="secret", routes=routes)
+
+        async def item(request: Request) -> JSONResponse:
+            return JSONResponse({"detail": "item"})
+
+        app.add_route("/items/{id}", item, methods=["GET"])
+        app.add_route("/items", item, methods=["GET"])
+        client = TestClient(app)
+        assert client.get("/items/1").status_code == 401
+        assert client.get("/items").status_code == 200
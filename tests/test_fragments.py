@@ -0,0 +1,147 @@
+from jinja2 import DictLoader, Environment
+from starlette.testclient import TestClient
+from pypox.application import PypoxHTMX
+from pypox.fragments import (
+    FileFragmentStorage,
+    FragmentCache,
+    FragmentCacheExtension,
+    MemoryFragmentStorage,
+    fragment_key,
+)
+import asyncio
+import os
+import time
+
+NAVIGATION = (
+    "{% cache 'navigation', role, ttl=ttl %}"
+    "{% for item in items %}<a>{{ item }}</a>{% endfor %}"
+    "{% endcache %}"
+)
+
+
+def environment(cache, enable_async=False):
+    env = Environment(
+        loader=DictLoader({"nav.html": NAVIGATION}),
+        extensions=[FragmentCacheExtension],
+        autoescape=True,
+        enable_async=enable_async,
+    )
+    env.fragment_cache = cache
+    return env
+
+
+class TestFragmentKey:
+
+    def test_stable(self):
+        assert fragment_key("a.html", "nav", [{"b": 1, "a": 2}]) == fragment_key(
+            "a.html", "nav", [{"a": 2, "b": 1}]
+        )
+
+    def test_parts(self):
+        key = fragment_key("a.html", "nav", ["admin"])
+        assert key != fragment_key("b.html", "nav", ["admin"])
+        assert key != fragment_key("a.html", "table", ["admin"])
+        assert key != fragment_key("a.html", "nav", ["user"])
+
+
+class TestMemoryFragmentStorage:
+
+    def test_lru(self):
+        storage = MemoryFragmentStorage(maxsize=2)
+        storage.set("a", "1", 60)
+        storage.set("b", "2", 60)
+        assert storage.get("a") == "1"
+        storage.set("c", "3", 60)
+        assert storage.get("b") is None
+        assert storage.get("a") == "1"
+        assert len(storage) == 2
+
+    def test_expiry(self):
+        storage = MemoryFragmentStorage()
+        storage.set("a", "1", -1)
+        assert storage.get("a") is None
+        assert len(storage) == 0
+
+
+class TestFileFragmentStorage:
+
+    def test_shared(self, tmp_path):
+        FileFragmentStorage(str(tmp_path)).set("a", "<p>é</p>", 60)
+        assert FileFragmentStorage(str(tmp_path)).get("a") == "<p>é</p>"
+
+    def test_expiry(self, tmp_path):
+        storage = FileFragmentStorage(str(tmp_path))
+        storage.set("a", "1", -1)
+        assert storage.get("a") is None
+        assert os.listdir(tmp_path) == []
+
+    def test_prune(self, tmp_path):
+        storage = FileFragmentStorage(str(tmp_path), maxsize=2, prune_interval=1)
+        storage.set("a", "1", 60)
+        storage.set("b", "2", 60)
+        past = time.time() - 10
+        os.utime(tmp_path / "b", (past, past))
+        storage.set("c", "3", 60)
+        assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+
+    def test_clear(self, tmp_path):
+        storage = FileFragmentStorage(str(tmp_path))
+        storage.set("a", "1", 60)
+        storage.clear()
+        assert storage.get("a") is None
+
+
+class TestFragmentCacheExtension:
+
+    def test_cached(self):
+        cache = FragmentCache()
+        template = environment(cache).get_template("nav.html")
+        first = template.render(role="admin", items=["<home>"], ttl=None)
+        second = template.render(role="admin", items=["changed"], ttl=None)
+        assert first == second == "<a>&lt;home&gt;</a>"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_varies(self):
+        template = environment(FragmentCache()).get_template("nav.html")
+        assert template.render(role="admin", items=["a"], ttl=None) == "<a>a</a>"
+        assert template.render(role="user", items=["b"], ttl=None) == "<a>b</a>"
+
+    def test_ttl(self):
+        template = environment(FragmentCache()).get_template("nav.html")
+        template.render(role="admin", items=["a"], ttl=-1)
+        assert template.render(role="admin", items=["b"], ttl=-1) == "<a>b</a>"
+
+    def test_without_cache(self):
+        template = environment(None).get_template("nav.html")
+        assert template.render(role="admin", items=["a"], ttl=None) == "<a>a</a>"
+
+    def test_async(self):
+        cache = FragmentCache()
+        template = environment(cache, enable_async=True).get_template("nav.html")
+
+        async def render(items):
+            return await template.render_async(role="admin", items=items, ttl=None)
+
+        assert asyncio.run(render(["a"])) == "<a>a</a>"
+        assert asyncio.run(render(["b"])) == "<a>a</a>"
+
+
+class TestPypoxHTMXFragmentCache:
+
+    def test_page(self, tmp_path):
+        directory = tmp_path / "pages"
+        os.makedirs(directory / "home")
+        (directory / "home" / "page.html").write_text(NAVIGATION)
+        (directory / "home" / "page.py").write_text(
+            "async def page(request):\n"
+            "    return request.app.state.templates.PageResponse(\n"
+            "        request, 'home/page.html',\n"
+            "        {'role': 'admin', 'items': [request.query_params['item']], 'ttl': 60},\n"
+            "    )\n"
+        )
+        cache = FragmentCache(FileFragmentStorage(str(tmp_path / "fragments")))
+        app = PypoxHTMX(str(directory), template_cache=False, fragment_cache=cache)
+        client = TestClient(app)
+        assert client.get("/home/?item=a").text == "<a>a</a>"
+        assert client.get("/home/?item=b").text == "<a>a</a>"
+        assert cache.hits == 1
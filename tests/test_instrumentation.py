@@ -0,0 +1,81 @@
+import os
+import pytest
+from starlette.requests import Request
+from starlette.testclient import TestClient
+from pypox._types import BodyDict, QueryInt
+from pypox.application import Pypox
+from pypox.instrumentation import (
+    CallbackHook,
+    SpanRecorder,
+    current_span,
+    instrumentation,
+    span_stack,
+)
+from pypox.router import HTTPRouter
+
+
+@pytest.fixture
+def recorded():
+    requests = []
+    hook = instrumentation.add_hook(
+        SpanRecorder(lambda root, spans: requests.append((root, spans)))
+    )
+    yield requests
+    instrumentation.remove_hook(hook)
+
+
+class TestInstrumentation:
+
+    def test_disabled_by_default(self):
+        assert not instrumentation.enabled
+        assert current_span() is None
+
+    def test_processor_stages(self, recorded):
+        async def create(quantity: QueryInt, data: BodyDict):
+            assert [span.name for span in span_stack()] == ["request", "handler"]
+            return {"quantity": quantity, **data}
+
+        app = Pypox()
+        app.add_route("/items", create, methods=["POST"])
+        response = TestClient(app).post("/items?quantity=2", json={"name": "item"})
+        assert response.json() == {"quantity": 2, "name": "item"}
+
+        root, spans = recorded[-1]
+        assert root.name == "request"
+        assert root.attributes == {"method": "POST", "path": "/items"}
+        assert [span.name for span in spans] == [
+            "route.match",
+            "extract",
+            "parse.body",
+            "handler",
+            "response.send",
+            "response.send",
+        ]
+        assert spans[1].attributes == {"parameter": "quantity", "source": "query"}
+        assert all(span.parent is root for span in spans)
+        assert all(span.end_ns >= span.start_ns for span in spans)
+
+    def test_method_route_ends_matching(self, recorded):
+        app = Pypox(
+            conventions=[HTTPRouter(os.path.dirname(__file__) + "/routing/app")]
+        )
+        assert TestClient(app).get("/1").status_code == 200
+        _, spans = recorded[-1]
+        assert spans[0].name == "route.match"
+        assert spans[-1].name == "response.send"
+        assert spans[-1].start_ns >= spans[0].end_ns
+
+    def test_callback_hook(self):
+        started, ended = [], []
+        hook = instrumentation.add_hook(CallbackHook(ended.append, started.append))
+        try:
+            with instrumentation.span("outer"):
+                with instrumentation.span("inner", key="value") as inner:
+                    assert current_span() is inner
+                    assert inner.parent.name == "outer"
+        finally:
+            instrumentation.remove_hook(hook)
+        assert [span.name for span in started] == ["outer", "inner"]
+        assert [span.name for span in ended] == ["inner", "outer"]
+        assert current_span() is None
+        assert not instrumentation.enabled
@@ -0,0 +1,206 @@
+from starlette.testclient import TestClient
+from pypox.application import PypoxHTMX
+from pypox.templating import PypoxTemplates, coalesce
+import os
+import pytest
+
+FRAGMENT_PAGE_SOURCE = """\
+async def page(request):
+    return request.app.state.templates.PageResponse(
+        request, "report/page.html", {"rows": [1, 2]}
+    )
+"""
+
+LAYOUT = "<html><nav>menu</nav>{% block report_table %}{% endblock %}</html>"
+
+REPORT = (
+    "{% extends 'base.html' %}{% block report_table %}"
+    "<table>{% for row in rows %}<tr>{{ row }}</tr>{% endfor %}</table>"
+    "{% endblock %}"
+)
+
+PAGE_SOURCE = """\
+async def page(request):
+    return request.app.state.templates.TemplateResponse(
+        request, "dashboard/page.html", {"name": "pypox"}
+    )
+"""
+
+
+def write(directory, files):
+    for path, source in files.items():
+        path = os.path.join(directory, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(source)
+    return str(directory)
+
+
+class TestPypoxTemplates:
+
+    def test_compile_all(self, tmp_path):
+        directory = write(
+            tmp_path / "pages",
+            {
+                "base.html": "<main>{% block content %}{% endblock %}</main>",
+                "dashboard/page.html": "{% extends 'base.html' %}{% block content %}{{ name }}{% endblock %}",
+                "dashboard/page.py": PAGE_SOURCE,
+            },
+        )
+        templates = PypoxTemplates(directory, cache_directory=str(tmp_path))
+        assert templates.compile_all() == ["base.html", "dashboard/page.html"]
+        assert templates.env.auto_reload is False
+        assert any(name.endswith(".cache") for name in os.listdir(tmp_path))
+
+    def test_skips_assets_and_broken_templates(self, tmp_path):
+        directory = write(
+            tmp_path / "pages",
+            {
+                "page.html": "{{ name }}",
+                "broken.html": "{% if %}",
+                "docs/notes.txt": "{% not a template",
+            },
+        )
+        app = PypoxHTMX(directory, template_cache=False)
+        assert app.templates.compiled == ["page.html"]
+        assert list(app.templates.compile_errors) == ["broken.html"]
+
+    def test_jinja_extensions(self, tmp_path):
+        templates = PypoxTemplates(
+            str(tmp_path), cache_directory=False, extensions=["jinja2.ext.do"]
+        )
+        assert "jinja2.ext.ExprStmtExtension" in templates.env.extensions
+        assert "pypox.fragments.FragmentCacheExtension" in templates.env.extensions
+
+    def test_cache_disabled(self, tmp_path):
+        templates = PypoxTemplates(str(tmp_path), cache_directory=False)
+        assert templates.env.bytecode_cache is None
+
+
+class TestPypoxHTMXTemplates:
+
+    def test_shared_environment(self, tmp_path):
+        directory = write(
+            tmp_path / "pages",
+            {
+                "base.html": "<main>{% block content %}{% endblock %}</main>",
+                "dashboard/page.html": "{% extends 'base.html' %}{% block content %}{{ name }}{% endblock %}",
+                "dashboard/page.py": PAGE_SOURCE,
+            },
+        )
+        app = PypoxHTMX(directory, template_cache=str(tmp_path / "cache"))
+        assert app.templates is not None
+        assert app.templates.compiled == ["base.html", "dashboard/page.html"]
+        with TestClient(app) as client:
+            response = client.get("/dashboard/")
+        assert response.status_code == 200
+        assert response.text == "<main>pypox</main>"
+
+    def test_debug_reloads(self, tmp_path):
+        directory = write(tmp_path / "pages", {"dashboard/page.py": PAGE_SOURCE})
+        app = PypoxHTMX(directory, template_cache=False, debug=True)
+        assert app.templates.env.auto_reload is True
+        assert app.templates.compiled == []
+
+
+class TestFragments:
+
+    def client(self, tmp_path, fragments=True):
+        directory = write(
+            tmp_path / "pages",
+            {
+                "base.html": LAYOUT,
+                "report/page.html": REPORT,
+                "report/page.py": FRAGMENT_PAGE_SOURCE,
+            },
+        )
+        return TestClient(
+            PypoxHTMX(directory, template_cache=False, fragments=fragments)
+        )
+
+    def test_full_page(self, tmp_path):
+        response = self.client(tmp_path).get("/report/")
+        assert (
+            response.text
+            == "<html><nav>menu</nav><table><tr>1</tr><tr>2</tr></table></html>"
+        )
+        assert response.headers["vary"] == "HX-Request, HX-Target"
+
+    def test_targeted_block(self, tmp_path):
+        response = self.client(tmp_path).get(
+            "/report/", headers={"hx-request": "true", "hx-target": "report-table"}
+        )
+        assert response.status_code == 200
+        assert response.text == "<table><tr>1</tr><tr>2</tr></table>"
+
+    def test_unknown_target(self, tmp_path):
+        response = self.client(tmp_path).get(
+            "/report/", headers={"hx-request": "true", "hx-target": "sidebar"}
+        )
+        assert response.text.startswith("<html>")
+
+    def test_disabled(self, tmp_path):
+        response = self.client(tmp_path, fragments=False).get(
+            "/report/", headers={"hx-request": "true", "hx-target": "report_table"}
+        )
+        assert response.text.startswith("<html>")
+
+
+class TestStreaming:
+
+    def app(self, tmp_path, **options):
+        directory = write(
+            tmp_path / "pages",
+            {
+                "base.html": LAYOUT,
+                "report/page.html": REPORT,
+                "report/page.py": FRAGMENT_PAGE_SOURCE,
+            },
+        )
+        return PypoxHTMX(
+            directory, template_cache=str(tmp_path / "cache"), streaming=True, **options
+        )
+
+    def test_full_page(self, tmp_path):
+        app = self.app(tmp_path)
+        assert app.templates.async_env.is_async
+        assert not app.templates.env.is_async
+        response = TestClient(app).get("/report/")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/html; charset=utf-8"
+        assert "content-length" not in response.headers
+        assert (
+            response.text
+            == "<html><nav>menu</nav><table><tr>1</tr><tr>2</tr></table></html>"
+        )
+
+    def test_fragment(self, tmp_path):
+        response = TestClient(self.app(tmp_path)).get(
+            "/report/", headers={"hx-request": "true", "hx-target": "report_table"}
+        )
+        assert response.text == "<table><tr>1</tr><tr>2</tr></table>"
+
+    def test_separate_bytecode(self, tmp_path):
+        self.app(tmp_path)
+        files = os.listdir(tmp_path / "cache")
+        assert any(name.startswith("__jinja2_async_") for name in files)
+        assert any(not name.startswith("__jinja2_async_") for name in files)
+
+    @pytest.mark.asyncio
+    async def test_coalesce(self):
+        async def chunks():
+            for chunk in ("ab", "c", "defg", "h"):
+                yield chunk
+
+        assert [chunk async for chunk in coalesce(chunks(), 3)] == ["abc", "defg", "h"]
+        assert [chunk async for chunk in coalesce(chunks(), 0)] == [
+            "ab",
+            "c",
+            "defg",
+            "h",
+        ]
+
+    def test_requires_streaming(self, tmp_path):
+        templates = PypoxTemplates(str(tmp_path), cache_directory=False)
+        with pytest.raises(RuntimeError):
+            templates.PageResponse(None, "page.html", stream=True)